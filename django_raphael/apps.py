@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class RaphaelConfig(AppConfig):
+    name = 'django_raphael'
+    verbose_name = 'Django Raphael'
+
+    def ready(self):
+        # Build every Tortoise model up front, the connections are opened by
+        # RaphaelLifespan (or lazily by the first query outside ASGI)
+        from django_raphael.bootstrap import register_models
+
+        register_models()
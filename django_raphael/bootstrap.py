@@ -0,0 +1,124 @@
+import asyncio
+import sys
+from types import ModuleType
+from typing import Dict, Any, List, Type
+
+from django.apps import apps
+from django.conf import settings
+from tortoise import Tortoise, connections
+
+from django_raphael.db import DjangoToTortoiseConverter
+
+# Name of the synthetic module holding every generated Tortoise model
+MODELS_MODULE = 'django_raphael.tortoise_models'
+
+_initialized = False
+_init_lock = asyncio.Lock()
+
+
+def get_raphael_models() -> List[Type]:
+    """Return every installed Django model that uses RaphaelMixin"""
+    from django_raphael.models import RaphaelMixin
+
+    return [model for model in apps.get_models() if issubclass(model, RaphaelMixin)]
+
+
+def register_models() -> ModuleType:
+    """Build the Tortoise model of every RaphaelMixin model in one pass"""
+    from django_raphael.models import TortoiseModelFactory
+
+    module = sys.modules.get(MODELS_MODULE)
+    if module is None:
+        module = ModuleType(MODELS_MODULE)
+        sys.modules[MODELS_MODULE] = module
+
+    module.__models__ = [
+        TortoiseModelFactory.create_model(model) for model in get_raphael_models()
+    ]
+    return module
+
+
+def get_tortoise_config() -> Dict[str, Any]:
+    """Build the Tortoise ORM config from Django settings"""
+    raphael_settings = getattr(settings, 'RAPHAEL', {})
+    overrides = raphael_settings.get('CONNECTIONS', {})
+
+    # One Tortoise connection per Django alias, so routers can pick any of them
+    return {
+        'connections': {
+            alias: DjangoToTortoiseConverter.get_connection_config(db_config, overrides.get(alias))
+            for alias, db_config in settings.DATABASES.items()
+        },
+        'apps': {
+            'models': {
+                'models': [register_models(), *raphael_settings.get('EXTRA_MODULES', [])],
+                'default_connection': 'default',
+            },
+        },
+        'use_tz': getattr(settings, 'USE_TZ', True),
+        'timezone': str(getattr(settings, 'TIME_ZONE', 'UTC')),
+    }
+
+
+async def init():
+    """Initialize Tortoise ORM and open every connection once"""
+    global _initialized
+
+    async with _init_lock:
+        if _initialized:
+            return
+
+        await Tortoise.init(config=get_tortoise_config())
+
+        # Open the connections now so the first request doesn't pay for it
+        for connection in connections.all():
+            await connection.execute_query('SELECT 1')
+
+        _initialized = True
+
+
+async def ensure_initialized():
+    """Initialize Tortoise ORM unless it is already running"""
+    if not _initialized:
+        await init()
+
+
+async def close():
+    """Close every Tortoise ORM connection"""
+    global _initialized
+
+    async with _init_lock:
+        if _initialized:
+            await Tortoise.close_connections()
+            _initialized = False
+
+
+class RaphaelLifespan:
+    """
+    ASGI wrapper that initializes Tortoise ORM at startup and closes it at shutdown.
+
+    Usage:
+        application = RaphaelLifespan(get_asgi_application())
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            await self.app(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await init()
+                except Exception as exc:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(exc)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
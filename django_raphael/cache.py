@@ -0,0 +1,164 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+from django_raphael import transactions
+
+# Marks a miss, None is a valid cached value
+MISSING = object()
+
+
+class QueryCache:
+    """
+    Result cache of one model: a bounded in-process LRU with TTL, optionally backed by a
+    Django cache backend shared between processes.
+
+    Entries are keyed on the operation, the database alias and the normalized lookup kwargs.
+    Any write through django-raphael invalidates the whole model, the backend tier is
+    invalidated by bumping a version number stored in the backend itself. With a backend,
+    local entries are only served while that version is unchanged, so a write in one
+    process invalidates every process.
+    """
+
+    def __init__(self, django_model, maxsize: int = 1024, backend: Optional[str] = None):
+        self.django_model = django_model
+        self.maxsize = maxsize
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Optional[int], Any]]' = OrderedDict()
+        self._generation = 0
+
+        opts = django_model._meta
+        self._prefix = f'raphael:{opts.app_label}.{opts.model_name}'
+        self._version_key = f'{self._prefix}:version'
+
+    @classmethod
+    def from_model(cls, django_model) -> 'QueryCache':
+        """Build the cache described by RaphaelMeta.cache, with an empty default"""
+        config = getattr(getattr(django_model, 'RaphaelMeta', None), 'cache', None) or {}
+        return cls(django_model, maxsize=config.get('maxsize', 1024), backend=config.get('backend'))
+
+    @staticmethod
+    def default_ttl(django_model) -> Optional[float]:
+        """TTL set by RaphaelMeta.cache, None when the model isn't cached by default"""
+        config = getattr(getattr(django_model, 'RaphaelMeta', None), 'cache', None)
+        if not config:
+            return None
+        return config.get('ttl', 60)
+
+    def make_key(self, operation: str, alias: str, lookups: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        Build a cache key that doesn't depend on how equivalent lookups are spelled.
+
+        Returns None when a lookup value isn't hashable, even once frozen.
+        """
+        opts = self.django_model._meta
+        normalized = []
+        for lookup, value in lookups.items():
+            if lookup.endswith('__exact'):
+                lookup = lookup[:-len('__exact')]
+            if lookup == 'pk':
+                lookup = opts.pk.name
+
+            # Cast values of plain field lookups, so id="1" and id=1 share an entry
+            if '__' not in lookup:
+                try:
+                    value = opts.get_field(lookup).to_python(value)
+                except (FieldDoesNotExist, ValidationError, TypeError):
+                    pass
+            normalized.append((lookup, _freeze(value)))
+
+        key = (operation, alias, tuple(sorted(normalized, key=repr)))
+        try:
+            hash(key)
+        except TypeError:
+            # A value we can't freeze, the lookup isn't cached
+            return None
+        return key
+
+    async def snapshot(self) -> Tuple[int, Optional[int]]:
+        """
+        The in-process generation and the backend version, read before querying the database.
+
+        Both change on every invalidation, the backend version also when another process
+        invalidates the model.
+        """
+        if self.backend is None:
+            return self._generation, None
+        return self._generation, await caches[self.backend].aget(self._version_key, 0)
+
+    async def get(self, key: Tuple, snapshot: Tuple[int, Optional[int]]) -> Any:
+        """Return the value cached as of `snapshot`, or MISSING"""
+        generation, version = snapshot
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, entry_version, value = entry
+            # Local entries cached before another process invalidated the model are stale
+            if expires > time.monotonic() and entry_version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self.backend is not None:
+            value = await caches[self.backend].aget(self._backend_key(key, version), MISSING)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return MISSING
+
+    async def set(self, key: Tuple, value: Any, ttl: float, snapshot: Tuple[int, Optional[int]]):
+        """Cache a value, unless the model was invalidated since `snapshot` was read"""
+        generation, version = snapshot
+        if generation != self._generation:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        if self.backend is not None:
+            await caches[self.backend].aset(self._backend_key(key, version), value, ttl)
+
+    async def invalidate(self):
+        """Drop every cached entry of the model"""
+        self._generation += 1
+        self._entries.clear()
+        # Rows read by other contexts until the transaction ends may be cached again
+        transactions.invalidate_on_exit(self)
+
+        if self.backend is not None:
+            backend = caches[self.backend]
+            try:
+                await backend.aincr(self._version_key)
+            except ValueError:
+                # The version key expired or was never set
+                await backend.aset(self._version_key, 1, None)
+
+    def _backend_key(self, key: Tuple, version: int) -> str:
+        digest = hashlib.md5(repr(key).encode()).hexdigest()
+        return f'{self._prefix}:{version}:{digest}'
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a lookup value: lists and dicts as tuples, sets in a stable order"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        # Sorted, so the backend key of equal sets is the same in every process
+        return tuple(sorted((_freeze(item) for item in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted(((key, _freeze(item)) for key, item in value.items()), key=repr))
+    return value
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers asking for the same key share one in-flight call.
+
+    The first caller starts the call, callers arriving while it runs await the same result.
+    Cancelling one caller doesn't cancel the shared call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.merged = 0
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of fn(), or of the call already running for key"""
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.calls += 1
+        else:
+            self.merged += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Calls sent to the database and calls merged into one already running"""
+        return {'calls': self.calls, 'merged': self.merged}
@@ -0,0 +1,110 @@
+from copy import copy
+from operator import attrgetter
+from typing import FrozenSet, Optional, Type
+
+from django.db import models
+from django.db.models.base import ModelState
+from tortoise.models import Model as TortoiseModel
+
+
+class InstanceBuilder:
+    """
+    Builds Django model instances the way Model.from_db does, compiled once per model.
+
+    Instances are created without running Model.__init__ (no kwargs parsing, defaults or
+    pre_init/post_init signals) and are marked as loaded from the database.
+    Django fields the Tortoise model doesn't map, or left out by `only`, are deferred.
+    The loaded values are kept on the instance state, so asave() can tell what changed.
+    """
+
+    def __init__(self, django_model: Type[models.Model], tortoise_model: Type[TortoiseModel],
+                 only: Optional[FrozenSet[str]] = None):
+        self.django_model = django_model
+        self.tortoise_model = tortoise_model
+        self.attnames = tuple(
+            field.attname for field in django_model._meta.concrete_fields
+            if field.attname in tortoise_model._meta.fields_map
+            and (only is None or field.attname in only)
+        )
+        self._partials = {}
+        # (name, converter) pairs of the annotations set on every instance
+        self.annotations = ()
+
+        # (column, converter) pairs for raw driver records, mirroring Model._init_from_db
+        meta = tortoise_model._meta
+        self.record_attnames = []
+        self._record_columns = []
+        for fields, convert in (
+            (meta.db_native_fields, lambda field: None),
+            (meta.db_default_fields, lambda field: field.field_type),
+            (meta.db_complex_fields, lambda field: field.to_python_value),
+        ):
+            for column, attname, field in fields:
+                if attname in self.attnames:
+                    self.record_attnames.append(attname)
+                    # Tortoise's only() selects every column aliased to its field name
+                    self._record_columns.append((column if only is None else attname, convert(field)))
+
+        getter = attrgetter(*self.attnames)
+        if len(self.attnames) == 1:
+            # attrgetter returns a bare value, not a tuple, for a single attribute
+            self._values = lambda obj: (getter(obj),)
+        else:
+            self._values = getter
+
+    def build(self, tortoise_obj, db='default'):
+        """Build a Django instance from a Tortoise object"""
+        instance = self._new(self.attnames, self._values(tortoise_obj), db)
+        for name, convert in self.annotations:
+            instance.__dict__[name] = _convert(convert, getattr(tortoise_obj, name))
+        return instance
+
+    def only(self, attnames) -> 'InstanceBuilder':
+        """Return the builder of rows holding only some fields, as selected by Tortoise's only()"""
+        key = frozenset(attnames)
+        builder = self._partials.get(key)
+        if builder is None:
+            builder = self._partials[key] = InstanceBuilder(self.django_model, self.tortoise_model, key)
+        return builder
+
+    def annotate(self, annotations) -> 'InstanceBuilder':
+        """Return a builder also setting annotations, given as (name, converter) pairs"""
+        builder = copy(self)
+        builder.annotations = tuple(annotations)
+        return builder
+
+    def values(self, tortoise_obj):
+        """Return the field values of a Tortoise object, in the order of attnames"""
+        return self._values(tortoise_obj)
+
+    def build_from_values(self, values, db='default'):
+        """Build a Django instance from values returned by values()"""
+        return self._new(self.attnames, values, db)
+
+    def build_from_record(self, record, db='default'):
+        """Build a Django instance straight from a driver record, skipping Tortoise objects"""
+        values = []
+        for column, convert in self._record_columns:
+            value = record[column]
+            if convert is not None and value is not None:
+                value = convert(value)
+            values.append(value)
+        instance = self._new(self.record_attnames, values, db)
+        for name, convert in self.annotations:
+            instance.__dict__[name] = _convert(convert, record[name])
+        return instance
+
+    def _new(self, attnames, values, db):
+        instance = self.django_model.__new__(self.django_model)
+        instance.__dict__.update(zip(attnames, values))
+
+        state = instance._state = ModelState()
+        state.adding = False
+        state.db = db
+        # (attnames, values) as loaded, see RaphaelMixin.get_dirty_fields()
+        state.raphael_loaded = (attnames, values)
+        return instance
+
+
+def _convert(convert, value):
+    return value if convert is None or value is None else convert(value)
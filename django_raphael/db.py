@@ -1,11 +1,117 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from urllib.parse import quote
 
 from tortoise import Tortoise
 
+# Django OPTIONS passed through untouched to the Tortoise client of each backend
+POSTGRES_OPTIONS = (
+    'minsize', 'maxsize', 'command_timeout', 'statement_cache_size', 'max_queries',
+    'max_inactive_connection_lifetime', 'max_cached_statement_lifetime',
+    'max_cacheable_statement_size', 'server_settings', 'application_name', 'schema', 'ssl',
+)
+MYSQL_OPTIONS = (
+    'minsize', 'maxsize', 'charset', 'connect_timeout', 'ssl', 'init_command', 'sql_mode',
+    'pool_recycle', 'storage_engine',
+)
+SQLITE_OPTIONS = ('journal_mode', 'journal_size_limit', 'foreign_keys')
+
 
 class DjangoToTortoiseConverter:
     """Converts Django database configuration to Tortoise ORM format"""
 
+    @staticmethod
+    def get_engine(db_config: Dict[str, Any]) -> str:
+        """Return the Tortoise backend matching a Django database ENGINE"""
+        engine = db_config.get('ENGINE', '')
+
+        if 'sqlite' in engine:
+            return 'tortoise.backends.sqlite'
+        if 'postgresql' in engine or 'psycopg' in engine:
+            return 'tortoise.backends.asyncpg'
+        if 'mysql' in engine:
+            return 'tortoise.backends.mysql'
+        raise ValueError(f"Unsupported database engine: {engine}")
+
+    @classmethod
+    def get_connection_config(cls, db_config: Dict[str, Any],
+                              overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Convert Django database configuration to a Tortoise ORM connection dict.
+
+        Maps OPTIONS (sslmode, pool sizes, timeouts, statement cache, server_settings, ...)
+        and CONN_MAX_AGE onto the Tortoise client, then applies `overrides`, usually taken
+        from settings.RAPHAEL['CONNECTIONS'][alias].
+        """
+        engine = cls.get_engine(db_config)
+        options = db_config.get('OPTIONS', {})
+
+        if engine == 'tortoise.backends.sqlite':
+            # Like Django's SQLite backend, provide REGEXP for __regex/__iregex
+            credentials = {
+                'file_path': str(db_config.get('NAME', 'db.sqlite3')),
+                'install_regexp_functions': True,
+            }
+            credentials.update((key, options[key]) for key in SQLITE_OPTIONS if key in options)
+
+        else:
+            credentials = {
+                'host': db_config.get('HOST') or ('localhost' if 'mysql' in engine else None),
+                'port': int(db_config.get('PORT') or (3306 if 'mysql' in engine else 5432)),
+                'user': db_config.get('USER', ''),
+                'password': db_config.get('PASSWORD', ''),
+                'database': db_config.get('NAME', ''),
+            }
+
+            if engine == 'tortoise.backends.asyncpg':
+                credentials.update(cls._get_postgres_options(db_config, options))
+            else:
+                credentials.update(cls._get_mysql_options(db_config, options))
+
+        credentials.update(overrides or {})
+        return {'engine': engine, 'credentials': credentials}
+
+    @staticmethod
+    def _get_postgres_options(db_config: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Map Django PostgreSQL OPTIONS onto asyncpg pool arguments"""
+        result = {}
+
+        # Django 5.1+ connection pool settings
+        pool = options.get('pool')
+        if isinstance(pool, dict):
+            if 'min_size' in pool:
+                result['minsize'] = pool['min_size']
+            if 'max_size' in pool:
+                result['maxsize'] = pool['max_size']
+            if 'max_idle' in pool:
+                result['max_inactive_connection_lifetime'] = pool['max_idle']
+
+        # CONN_MAX_AGE=None keeps connections forever, 0 keeps asyncpg's default
+        conn_max_age = db_config.get('CONN_MAX_AGE', 0)
+        if conn_max_age is None:
+            result['max_inactive_connection_lifetime'] = 0
+        elif conn_max_age > 0:
+            result['max_inactive_connection_lifetime'] = conn_max_age
+
+        if 'sslmode' in options:
+            result['ssl'] = options['sslmode']
+        if 'connect_timeout' in options:
+            result['timeout'] = options['connect_timeout']
+
+        result.update((key, options[key]) for key in POSTGRES_OPTIONS if key in options)
+        return result
+
+    @staticmethod
+    def _get_mysql_options(db_config: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Map Django MySQL OPTIONS onto the Tortoise MySQL client arguments"""
+        result = {}
+
+        conn_max_age = db_config.get('CONN_MAX_AGE', 0)
+        if conn_max_age:
+            result['pool_recycle'] = conn_max_age
+
+        result.update((key, options[key]) for key in MYSQL_OPTIONS if key in options)
+        return result
+
     @staticmethod
     def get_db_url(db_config: Dict[str, Any]) -> str:
         """Convert Django database configuration to Tortoise ORM URL"""
@@ -36,9 +142,9 @@ class DjangoToTortoiseConverter:
 
         url = f"{scheme}://"
         if user:
-            url += user
+            url += quote(user, safe='')
             if password:
-                url += f":{password}"
+                url += f":{quote(password, safe='')}"
             url += "@"
         url += host
         if port:
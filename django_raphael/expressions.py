@@ -0,0 +1,355 @@
+import datetime
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import models
+from django.db.models import Aggregate, Avg, Count, F, ForeignObjectRel, Max, Min, Q, Sum, Value
+from django.db.models.expressions import CombinedExpression, Star
+from django.db.models.sql import Query
+from django.utils import timezone
+from pypika_tortoise.terms import ValueWrapper
+from tortoise import expressions, functions
+
+# Date transforms compared as a range of the column, so every backend and index serves them
+PERIODS = ('year', 'date')
+# Date parts Tortoise extracts with EXTRACT, equality only and not on SQLite
+EXTRACTS = ('quarter', 'month', 'week', 'day', 'hour', 'minute', 'second', 'microsecond')
+
+
+class ExpressionConverter:
+    """
+    Translates Django query expressions (aggregates, F, Value, arithmetic and Q trees)
+    into their Tortoise ORM equivalents, for one model.
+
+    Usage:
+        converter.convert(Sum(F("price") * F("quantity"), filter=Q(paid=True)))
+    """
+
+    AGGREGATES = {
+        Avg: functions.Avg,
+        Count: functions.Count,
+        Max: functions.Max,
+        Min: functions.Min,
+        Sum: functions.Sum,
+    }
+
+    CONNECTORS = {
+        CombinedExpression.ADD: expressions.Connector.add,
+        CombinedExpression.SUB: expressions.Connector.sub,
+        CombinedExpression.MUL: expressions.Connector.mul,
+        CombinedExpression.DIV: expressions.Connector.div,
+        CombinedExpression.POW: expressions.Connector.pow,
+        CombinedExpression.MOD: expressions.Connector.mod,
+    }
+
+    # Django lookups spelled differently by Tortoise, None when it has no suffix
+    LOOKUPS = {
+        'exact': None,
+        'regex': 'posix_regex',
+        'iregex': 'iposix_regex',
+    }
+
+    # Entries of each memo, they are keyed on values built by callers so they must be bounded
+    MEMO_SIZE = 1024
+
+    def __init__(self, django_model):
+        self.django_model = django_model
+        self._to_python = _Memo(self.MEMO_SIZE)
+        # Compiled Q builders, by tree shape
+        self._filters = _Memo(self.MEMO_SIZE)
+        self._names = _Memo(self.MEMO_SIZE)
+
+    def resolve_name(self, name: str) -> str:
+        """Tortoise name of a Django field reference: pk is the real key, a ForeignKey its key field"""
+        return self._names.get_or_set(name, self._resolve_name)
+
+    def _resolve_name(self, name):
+        from django_raphael.models import is_hidden_relation
+
+        parts = name.split('__')
+        model = self.django_model
+        for index, part in enumerate(parts):
+            try:
+                field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+            except FieldDoesNotExist:
+                # Lookups, transforms and names only Tortoise knows
+                break
+            if not field.is_relation:
+                parts[index] = field.attname
+                break
+            if field.related_model is None or (isinstance(field, ForeignObjectRel) and is_hidden_relation(field)):
+                break
+
+            if isinstance(field, ForeignObjectRel):
+                # Django queries reverse relations by their query name, Tortoise by the accessor
+                parts[index] = field.get_accessor_name()
+            elif field.concrete:
+                # author, author__pk and author__in compare the key, author__name follows the relation
+                target = parts[index + 1] if index + 1 < len(parts) else None
+                if target is None or target == 'pk' or _get_field(field.related_model, [target]) is None:
+                    parts[index:index + (2 if target == 'pk' else 1)] = [field.attname]
+                    break
+                parts[index] = field.name
+            else:
+                parts[index] = field.name
+            model = field.related_model
+        return '__'.join(parts)
+
+    def convert(self, expression):
+        """Return the Tortoise expression of a Django expression"""
+        if isinstance(expression, Aggregate):
+            return self._convert_aggregate(expression)
+        if isinstance(expression, F):
+            return expressions.F(self.resolve_name(expression.name))
+        if isinstance(expression, Value):
+            return expressions.Value(expression.value)
+        if isinstance(expression, CombinedExpression):
+            connector = self.CONNECTORS.get(expression.connector)
+            if connector is None:
+                raise ValueError(f"Unsupported connector '{expression.connector}'")
+            return expressions.CombinedExpression(
+                self.convert(expression.lhs), connector, self.convert(expression.rhs)
+            )
+        if isinstance(expression, Q):
+            return self.convert_q(expression)
+        if isinstance(expression, str):
+            return expressions.F(self.resolve_name(expression))
+        if isinstance(expression, (expressions.Expression, functions.Function)):
+            # Already a Tortoise expression, as aggregate() used to take
+            return expression
+        raise ValueError(f'Cannot translate {expression!r} to a Tortoise expression')
+
+    def _convert_aggregate(self, aggregate):
+        function = self.AGGREGATES.get(type(aggregate))
+        if function is None:
+            raise ValueError(f'Unsupported aggregate {type(aggregate).__name__}')
+
+        source, = aggregate.source_expressions
+        if isinstance(source, Star):
+            field = self.django_model._meta.pk.attname
+        elif isinstance(source, F):
+            field = self.resolve_name(source.name)
+        else:
+            field = self.convert(source)
+
+        _filter = None if aggregate.filter is None else self.convert_q(aggregate.filter)
+        result = function(field, distinct=aggregate.distinct, _filter=_filter)
+        if aggregate.default is not None:
+            result = functions.Coalesce(result, aggregate.default)
+        return result
+
+    def convert_q(self, q: Q) -> expressions.Q:
+        """Return the Tortoise Q of a Django Q tree"""
+        values = []
+        build = self._filters.get_or_set(_shape(q, values), self._compile)
+        return build(iter(values))
+
+    def convert_filter(self, args, kwargs) -> expressions.Q:
+        """Return the Tortoise Q of filter()/exclude() arguments"""
+        for arg in args:
+            if not isinstance(arg, Q):
+                raise TypeError(f'Cannot filter against a non-conditional expression {arg!r}')
+        return self.convert_q(Q(*args, **kwargs))
+
+    def convert_update(self, kwargs) -> Dict[str, Any]:
+        """Return update() kwargs with Tortoise field names and expressions"""
+        return {self.resolve_name(name): self.convert_value(value) for name, value in kwargs.items()}
+
+    def _compile(self, shape) -> Callable:
+        """
+        Build the function turning the values of a Q tree shape into a Tortoise Q,
+        so lookups are only resolved once per shape.
+        """
+        if isinstance(shape, str):
+            return self._compile_lookup(shape)
+
+        connector, negated, children = shape
+        if connector not in (Q.AND, Q.OR):
+            raise ValueError(f"Unsupported Q connector '{connector}'")
+        builders = [self._compile(child) for child in children]
+
+        def build(values):
+            result = expressions.Q(*[build_child(values) for build_child in builders], join_type=connector)
+            return ~result if negated else result
+        return build
+
+    def _compile_lookup(self, lookup):
+        """Build the function turning the value of one lookup into a Tortoise Q"""
+        transform = self._get_date_transform(lookup)
+        if transform is None:
+            key = self.resolve_lookup(lookup)
+            convert_value = self.convert_value
+            return lambda values: expressions.Q(**{key: convert_value(next(values))})
+
+        path, field, name, lookup_type = transform
+        key = self.resolve_name(path)
+        if name in PERIODS:
+            return _compile_period(key, name, lookup_type, isinstance(field, models.DateTimeField))
+        if lookup_type != 'exact':
+            raise ValueError(f"Unsupported lookup '{lookup}'")
+        # Tortoise would encode the number as a date, a term is compared as is
+        key = f'{key}__{name}'
+        return lambda values: expressions.Q(**{key: ValueWrapper(int(next(values)))})
+
+    def _get_date_transform(self, lookup):
+        """(field path, field, transform, lookup type) of a date transform lookup, else None"""
+        parts = lookup.split('__')
+        for index in range(1, len(parts)):
+            name = parts[index]
+            if name not in PERIODS and name not in EXTRACTS:
+                continue
+            field = _get_field(self.django_model, parts[:index])
+            if not isinstance(field, models.DateField):
+                continue
+            if name == 'date' and not isinstance(field, models.DateTimeField):
+                continue
+            if len(parts) > index + 2:
+                raise ValueError(f"Unsupported lookup '{lookup}'")
+            lookup_type = parts[index + 1] if len(parts) > index + 1 else 'exact'
+            return '__'.join(parts[:index]), field, name, lookup_type
+        return None
+
+    def resolve_lookup(self, lookup: str) -> str:
+        """Tortoise spelling of a Django lookup, like title__exact or published__year__gte"""
+        name, sep, suffix = lookup.rpartition('__')
+        if sep and suffix in self.LOOKUPS:
+            suffix = self.LOOKUPS[suffix]
+            lookup = f'{name}__{suffix}' if suffix else name
+        return self.resolve_name(lookup)
+
+    def convert_value(self, value):
+        """Tortoise value of a lookup value: expressions are translated, instances give their key"""
+        if isinstance(value, (F, CombinedExpression, Value)):
+            return self.convert(value)
+        if isinstance(value, models.Model):
+            return value.pk
+        if isinstance(value, (list, tuple, set, frozenset)):
+            # author__in=[...] and range lookups
+            return type(value)(self.convert_value(item) for item in value)
+        return value
+
+    def to_python(self, expression) -> Optional[Callable]:
+        """Converter of raw database values to the Django output type of an expression"""
+        try:
+            return self._to_python.get_or_set(expression, self._get_to_python)
+        except TypeError:
+            # Unhashable expression, not memoized
+            return self._get_to_python(expression)
+
+    def _get_to_python(self, expression):
+        try:
+            resolved = expression.resolve_expression(Query(self.django_model))
+            return resolved.output_field.to_python
+        except (FieldError, FieldDoesNotExist, AttributeError, TypeError):
+            # References to other annotations can't be resolved on their own
+            return None
+
+
+class _Memo:
+    """LRU memo of a function result, dropping the least recently used entries past maxsize"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Any, Any]' = OrderedDict()
+
+    def get_or_set(self, key, compute: Callable[[Any], Any]) -> Any:
+        """Return the memoized compute(key), computing it on a miss"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            value = self._entries[key] = compute(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        self._entries.move_to_end(key)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def contains_aggregate(expression) -> bool:
+    """Whether an unresolved Django expression computes an aggregate"""
+    if isinstance(expression, Aggregate):
+        return True
+    return any(
+        contains_aggregate(source) for source in getattr(expression, 'get_source_expressions', list)()
+        if source is not None
+    )
+
+
+def _shape(q, values):
+    """Hashable structure of a Q tree, its connectors and lookups, collecting the values apart"""
+    if isinstance(q, Q):
+        return q.connector, q.negated, tuple(_shape(child, values) for child in q.children)
+    lookup, value = q
+    values.append(value)
+    return lookup
+
+
+def _get_field(model, parts):
+    """Django field at the end of a path of field names, or None"""
+    field = None
+    for part in parts:
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def _period_bounds(name, value, datetimes):
+    """Start and exclusive end of the year or day of a value, like Django's year lookups"""
+    if name == 'year':
+        start, end = datetime.date(int(value), 1, 1), datetime.date(int(value) + 1, 1, 1)
+    else:
+        start = models.DateField().to_python(value)
+        end = start + datetime.timedelta(days=1)
+    if not datetimes:
+        return start, end
+
+    start = datetime.datetime.combine(start, datetime.time.min)
+    end = datetime.datetime.combine(end, datetime.time.min)
+    if settings.USE_TZ:
+        tz = timezone.get_current_timezone()
+        start, end = timezone.make_aware(start, tz), timezone.make_aware(end, tz)
+    return start, end
+
+
+def _compile_period(key, name, lookup_type, datetimes):
+    """Build the function turning the value of a year/date lookup into a range Q"""
+    def bounds(value):
+        return _period_bounds(name, value, datetimes)
+
+    def exact(value):
+        start, end = bounds(value)
+        return expressions.Q(**{f'{key}__gte': start, f'{key}__lt': end})
+
+    if lookup_type == 'exact':
+        return lambda values: exact(next(values))
+    if lookup_type == 'gt':
+        return lambda values: expressions.Q(**{f'{key}__gte': bounds(next(values))[1]})
+    if lookup_type == 'gte':
+        return lambda values: expressions.Q(**{f'{key}__gte': bounds(next(values))[0]})
+    if lookup_type == 'lt':
+        return lambda values: expressions.Q(**{f'{key}__lt': bounds(next(values))[0]})
+    if lookup_type == 'lte':
+        return lambda values: expressions.Q(**{f'{key}__lt': bounds(next(values))[1]})
+    if lookup_type == 'range':
+        def between(values):
+            low, high = next(values)
+            return expressions.Q(**{f'{key}__gte': bounds(low)[0], f'{key}__lt': bounds(high)[1]})
+        return between
+    if lookup_type == 'in':
+        def any_of(values):
+            periods = [exact(value) for value in next(values)]
+            if not periods:
+                return expressions.Q(**{f'{key}__in': []})
+            return expressions.Q(*periods, join_type=expressions.Q.OR)
+        return any_of
+    raise ValueError(f"Unsupported lookup '{key}__{name}__{lookup_type}'")
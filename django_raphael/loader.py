@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, Dict, List
+
+from tortoise.exceptions import DoesNotExist
+
+from django_raphael.transactions import active_aliases
+
+
+class BatchLoader:
+    """
+    Batches get() lookups on the primary key or a unique field.
+
+    Every lookup made in the same event loop iteration is sent as one
+    `WHERE field IN (...)` query through in_bulk(), then each awaiter gets its own
+    instance, or DoesNotExist.
+
+    Usage:
+        books = await asyncio.gather(*(Book.aobjects.loader.get(id=id) for id in ids))
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._pending: Dict[str, Dict[Any, List[asyncio.Future]]] = {}
+        self._scheduled = False
+        self._tasks = set()
+
+    def get(self, **kwargs) -> asyncio.Future:
+        """Schedule a lookup on a single pk/unique field and return an awaitable"""
+        if len(kwargs) != 1:
+            raise TypeError('loader.get() takes exactly one pk or unique field lookup')
+        (lookup, value), = kwargs.items()
+
+        if active_aliases():
+            # Batches are shared with callers outside the transaction, run on its connection instead
+            return asyncio.ensure_future(self.manager.get(**kwargs))
+
+        opts = self.manager.django_model._meta
+        if lookup.endswith('__exact'):
+            lookup = lookup[:-len('__exact')]
+        field = opts.pk if lookup == 'pk' else opts.get_field(lookup)
+        if not (field.primary_key or field.unique):
+            raise ValueError(f"'{lookup}' is neither the primary key nor a unique field")
+
+        # Cast the value, so id="1" and id=1 share a slot and match the loaded objects
+        value = field.to_python(value)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(field.name, {}).setdefault(value, []).append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    def load(self, pk) -> asyncio.Future:
+        """Schedule a lookup on the primary key"""
+        return self.get(pk=pk)
+
+    async def load_many(self, pks) -> List[Any]:
+        """Load several objects by primary key in one batch"""
+        return await asyncio.gather(*(self.load(pk) for pk in pks))
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        for field_name, batch in pending.items():
+            # Hold a reference so the task isn't garbage collected while it runs
+            task = asyncio.ensure_future(self._load(field_name, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, field_name, batch):
+        """Load one batch and resolve the futures waiting on it"""
+        try:
+            objects = await self.manager.in_bulk(list(batch), field_name=field_name)
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        builder = self.manager._builder
+        for value, futures in batch.items():
+            obj = objects.get(value)
+            for index, future in enumerate(futures):
+                if future.done():
+                    continue
+                if obj is None:
+                    future.set_exception(DoesNotExist(self.manager.tortoise_model))
+                elif index == 0:
+                    future.set_result(obj)
+                else:
+                    # Every awaiter gets its own instance
+                    future.set_result(builder.build_from_values(builder.values(obj), obj._state.db))
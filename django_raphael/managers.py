@@ -1,323 +1,1500 @@
 import asyncio
-from typing import Type, Optional, Dict, Any, List
-from django.db import models
-from django.conf import settings
-from tortoise import Tortoise, fields
-from tortoise.models import Model as TortoiseModel
+import base64
+import json
+import sqlite3
+from functools import partial
+from operator import itemgetter
+from typing import Type, Optional, Dict, Any, List, NamedTuple
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import models, router
+from django.db.models.utils import create_namedtuple_class
+from django.db.transaction import TransactionManagementError
+from pypika_tortoise.terms import Case, Tuple
+from tortoise import connections
+from tortoise.exceptions import DoesNotExist, MultipleObjectsReturned
+from tortoise.transactions import in_transaction
+
+from django_raphael import bootstrap
+from django_raphael.cache import MISSING, QueryCache
+from django_raphael.coalescing import SingleFlight
+from django_raphael.converters import InstanceBuilder
+from django_raphael.expressions import ExpressionConverter, contains_aggregate
+from django_raphael.loader import BatchLoader
+from django_raphael.statements import UNCOMPILABLE, CompiledQueryCache
+from django_raphael.transactions import active_aliases
+
+# Bind parameter limit of each driver, bulk statements are batched to stay under it
+MAX_QUERY_PARAMS = {
+    'postgres': 32767,
+    'mysql': 65535,
+    'sqlite': 999,
+}
+
 
 class RaphaelManager:
     """Async manager for Django models"""
 
-    _initialized = False
-    _init_lock = asyncio.Lock()
-    _tortoise_models: Dict[str, Type[TortoiseModel]] = {}
+    # Methods that need Tortoise, they are shadowed by _cold_call until it is initialized
+    _cold_methods = (
+        'get', 'get_or_none', 'create', 'get_or_create', 'update_or_create', 'bulk_create',
+        'acopy_from', 'bulk_update', 'count', 'exists', 'aggregate', 'first', 'last',
+        'earliest', 'latest', 'in_bulk', 'delete', 'update',
+    )
 
     def __init__(self, django_model: Type[models.Model]):
         self.django_model = django_model
         self.tortoise_model = None
+        self._builder = None
+        self._db = None
+
+        # Shared by every clone, so writes through any of them invalidate it
+        self._cache = QueryCache.from_model(django_model)
+        self._cache_ttl = QueryCache.default_ttl(django_model)
+        self._flights = SingleFlight()
+        self._compiled = CompiledQueryCache.from_model(django_model)
+        self._loaders = {}
+        self._coalesce = getattr(getattr(django_model, 'RaphaelMeta', None), 'coalesce', False)
+        self._expressions = ExpressionConverter(django_model)
+
+        self._install_cold_methods()
+
+    def _install_cold_methods(self):
+        for name in self._cold_methods:
+            setattr(self, name, partial(self._cold_call, name))
+
+    def _clone(self, **changes):
+        """Return a copy of this manager with some of its state replaced"""
+        manager = self.__class__.__new__(self.__class__)
+        manager.__dict__.update(
+            (key, value) for key, value in self.__dict__.items() if key not in self._cold_methods
+        )
+        manager.__dict__.update(changes)
+        if manager.tortoise_model is None:
+            manager._install_cold_methods()
+        return manager
 
-    async def _ensure_initialized(self):
-        """Ensure Tortoise ORM is initialized"""
-        if self._initialized:
-            return
-
-        async with self._init_lock:
-            if self._initialized:
-                return
-
-            # Get Django database configuration
-            db_config = settings.DATABASES.get('default', {})
-            db_url = DjangoToTortoiseConverter.get_db_url(db_config)
-
-            # Create all Tortoise models first
-            tortoise_models = {}
-
-            # Get the model for this manager
-            model_key = f"{self.django_model._meta.app_label}.{self.django_model._meta.model_name}"
-            if model_key not in self._tortoise_models:
-                self.tortoise_model = TortoiseModelFactory.create_model(self.django_model)
-                self._tortoise_models[model_key] = self.tortoise_model
-                tortoise_models[self.tortoise_model.__name__] = self.tortoise_model
-            else:
-                self.tortoise_model = self._tortoise_models[model_key]
-                tortoise_models[self.tortoise_model.__name__] = self.tortoise_model
-
-            # Initialize Tortoise with the models
-            await Tortoise.init(
-                db_url=db_url,
-                modules={'models': list(tortoise_models.values())},
-                use_tz=getattr(settings, 'USE_TZ', True),
-                timezone=str(getattr(settings, 'TIME_ZONE', 'UTC'))
-            )
+    async def _cold_call(self, method, /, *args, **kwargs):
+        """Initialize Tortoise ORM, then run the real method"""
+        await self._ensure_initialized()
+        return await getattr(self, method)(*args, **kwargs)
 
-            # Generate schemas
-            await Tortoise.generate_schemas(safe=True)
+    async def _ensure_initialized(self):
+        """Ensure Tortoise ORM is initialized and return the Tortoise model"""
+        if self.tortoise_model is not None:
+            return self.tortoise_model
+
+        from django_raphael.models import TortoiseModelFactory
+
+        # Normally done by RaphaelLifespan at startup, this only runs outside ASGI
+        await bootstrap.ensure_initialized()
+        self.tortoise_model = TortoiseModelFactory.create_model(self.django_model)
+        self._builder = InstanceBuilder(self.django_model, self.tortoise_model)
+
+        # Drop the cold stubs, from now on calls go straight to the class methods
+        for name in self._cold_methods:
+            self.__dict__.pop(name, None)
+
+        return self.tortoise_model
+
+    def _db_for_read(self, **hints):
+        """Return the Tortoise connection Django's routers pick for reads"""
+        if self._db is None and active_aliases():
+            # Inside atomic(), reads see the transaction's writes rather than a replica
+            alias = router.db_for_write(self.django_model, **hints)
+            if alias in active_aliases():
+                return connections.get(alias)
+        return connections.get(self._db or router.db_for_read(self.django_model, **hints))
+
+    def _db_for_write(self, **hints):
+        """Return the Tortoise connection Django's routers pick for writes"""
+        return connections.get(self._db or router.db_for_write(self.django_model, **hints))
+
+    def using(self, alias):
+        """Return a manager bound to the database alias, bypassing the routers"""
+        return self._clone(_db=alias)
+
+    def cached(self, ttl=60):
+        """Return a manager whose get() and get_or_none() results are cached for ttl seconds"""
+        return self._clone(_cache_ttl=ttl)
+
+    @property
+    def loader(self):
+        """BatchLoader merging the get() lookups of one loop iteration into one query"""
+        loader = self._loaders.get(self._db)
+        if loader is None:
+            loader = self._loaders[self._db] = BatchLoader(self)
+        return loader
+
+    def coalesced(self, enabled=True):
+        """Return a manager whose identical concurrent reads share one database call"""
+        return self._clone(_coalesce=enabled)
+
+    def stats(self):
+        """Result cache, read coalescing and compiled query counters of the model"""
+        return {
+            'cache': self._cache.stats(),
+            'coalescing': self._flights.stats(),
+            'compiled_queries': self._compiled.stats(),
+        }
 
-            RaphaelManager._initialized = True
+    async def invalidate_cache(self):
+        """Drop the cached results of the model, for writes made outside django-raphael"""
+        await self._cache.invalidate()
+
+    async def _cached_get(self, operation, db, kwargs):
+        """Run get/get_or_none through the result cache"""
+        cache = self._cache
+        key = cache.make_key(operation, db.connection_name, kwargs)
+        if key is None:
+            return await self._get(operation, db, kwargs)
+
+        snapshot = await cache.snapshot()
+        values = await cache.get(key, snapshot)
+        if values is not MISSING:
+            return self._builder.build_from_values(values, db.connection_name)
+
+        result = await self._get(operation, db, kwargs)
+        if result is not None:
+            await cache.set(key, self._builder.values(result), self._cache_ttl, snapshot)
+        return result
+
+    async def _get(self, operation, db, kwargs):
+        """Run get/get_or_none from the compiled query of its lookups, building it on a miss"""
+        key = ('get', db.connection_name, tuple(kwargs), (), 2)
+        values = tuple(kwargs.values())
+        # None turns into IS NULL, a different query than the compiled one
+        compiled = UNCOMPILABLE if None in values else self._compiled.get(key)
+        if compiled is None or compiled is UNCOMPILABLE:
+            queryset = self.tortoise_model.filter(**kwargs).using_db(db).limit(2)
+            queryset._choose_db_if_not_chosen()
+            queryset._make_query()
+            sql, params = queryset.query.get_parameterized_sql()
+            if compiled is None:
+                compiled = self._compiled.compile(self.tortoise_model, key[2], values, sql, params)
+                self._compiled.set(key, compiled)
+        else:
+            sql, params = compiled.sql, compiled.params(values)
+
+        records = await self._execute(db, sql, params)
+        return self._one_from_records(operation, records, db.connection_name, self._builder)
+
+    async def _get_from_records(self, operation, queryset, builder=None):
+        """get/get_or_none over raw records, with Tortoise's exceptions"""
+        records = await self._fetch_records(queryset.limit(2))
+        alias = queryset._db.connection_name
+        return self._one_from_records(operation, records, alias, builder or self._builder)
+
+    def _one_from_records(self, operation, records, alias, builder):
+        """The instance of the only record, with Tortoise's exceptions"""
+        if len(records) > 1:
+            raise MultipleObjectsReturned(self.tortoise_model)
+        if not records:
+            if operation == 'get':
+                raise DoesNotExist(self.tortoise_model)
+            return None
+        return builder.build_from_record(records[0], alias)
 
-    def _to_django(self, tortoise_obj):
+    def _to_django(self, tortoise_obj, db):
         """Convert Tortoise object to Django model instance"""
         if tortoise_obj is None:
             return None
+        return self._builder.build(tortoise_obj, db.connection_name)
 
-        kwargs = {}
-        for field in self.django_model._meta.fields:
-            if hasattr(tortoise_obj, field.name):
-                value = getattr(tortoise_obj, field.name)
-                kwargs[field.name] = value
+    def _to_django_list(self, tortoise_objs, db):
+        """Convert list of Tortoise objects to Django model instances"""
+        build = self._builder.build
+        alias = db.connection_name
+        return [build(obj, alias) for obj in tortoise_objs]
+
+    def _get_relation(self, name):
+        """Return the forward field or reverse relation a select/prefetch lookup names"""
+        opts = self.django_model._meta
+        for field in (*opts.fields, *opts.many_to_many):
+            if field.is_relation and field.name == name:
+                relation = field
+                break
+        else:
+            from django_raphael.models import is_hidden_relation
 
-        return self.django_model(**kwargs)
+            for rel in opts.related_objects:
+                if not is_hidden_relation(rel) and rel.get_accessor_name() == name:
+                    relation = rel
+                    break
+            else:
+                raise ValueError(f"Invalid related lookup '{name}' on {self.django_model.__name__}")
 
-    def _to_django_list(self, tortoise_objs):
-        """Convert list of Tortoise objects to Django model instances"""
-        return [self._to_django(obj) for obj in tortoise_objs]
+        from django_raphael.models import RaphaelMixin
 
-    async def all(self):
-        """Get all objects"""
-        await self._ensure_initialized()
-        results = await self.tortoise_model.all()
-        return self._to_django_list(results)
+        if not issubclass(relation.related_model, RaphaelMixin):
+            raise ValueError(
+                f"Cannot load '{name}', {relation.related_model.__name__} doesn't use RaphaelMixin"
+            )
+        return relation
+
+    async def _ensure_related(self, tree):
+        """Initialize the managers of every model a lookup tree reaches"""
+        for name, subtree in tree.items():
+            manager = self._get_relation(name).related_model.aobjects
+            await manager._ensure_initialized()
+            await manager._ensure_related(subtree)
+
+    def _build_with_related(self, tortoise_obj, tree, alias, builder=None):
+        """Convert a Tortoise object and the related objects it loaded into Django's caches"""
+        instance = (builder or self._builder).build(tortoise_obj, alias)
+
+        for name, subtree in tree.items():
+            relation = self._get_relation(name)
+            build = partial(relation.related_model.aobjects._build_with_related, tree=subtree, alias=alias)
+
+            if relation.one_to_many or relation.many_to_many:
+                related = [build(obj) for obj in getattr(tortoise_obj, name).related_objects]
+
+                # Mirror what Django's prefetch_related stores
+                if relation.one_to_many:
+                    cache_name = relation.get_accessor_name()
+                elif relation.concrete:
+                    cache_name = relation.name
+                else:
+                    cache_name = relation.field.related_query_name()
+                queryset = getattr(instance, name).get_queryset()
+                queryset._result_cache = related
+                queryset._prefetch_done = True
+                instance.__dict__.setdefault('_prefetched_objects_cache', {})[cache_name] = queryset
+            else:
+                obj = getattr(tortoise_obj, f'_{name}', None)
+                relation.set_cached_value(instance, build(obj) if obj is not None else None)
+
+        return instance
+
+    async def _fetch_records(self, queryset, where=None):
+        """Execute the SQL Tortoise builds for a queryset and return the raw driver records"""
+        queryset._choose_db_if_not_chosen()
+        queryset._make_query()
+        if where is not None:
+            queryset.query = queryset.query.where(where)
+        sql, params = queryset.query.get_parameterized_sql()
+        return await self._execute(queryset._db, sql, params)
+
+    async def _execute(self, db, sql, params):
+        """Run a parameterized query and return the raw driver records"""
+        if self._coalesce and not active_aliases():
+            # Records are shared between callers, each one builds its own instances
+            key = (db.connection_name, sql, repr(params))
+            _, records = await self._flights.run(key, partial(db.execute_query, sql, params))
+        else:
+            _, records = await db.execute_query(sql, params)
+        return records
 
-    async def filter(self, **kwargs):
-        """Filter objects"""
-        await self._ensure_initialized()
-        results = await self.tortoise_model.filter(**kwargs)
-        return self._to_django_list(results)
+    def get_queryset(self):
+        """Return a new lazy QuerySet over all objects"""
+        return RaphaelQuerySet(self)
 
-    async def exclude(self, **kwargs):
-        """Exclude objects"""
-        await self._ensure_initialized()
-        results = await self.tortoise_model.exclude(**kwargs)
-        return self._to_django_list(results)
+    def all(self):
+        """Return a QuerySet over all objects"""
+        return self.get_queryset()
+
+    def filter(self, *args, **kwargs):
+        """Return a QuerySet filtered by Q objects and kwargs"""
+        return self.get_queryset().filter(*args, **kwargs)
+
+    def exclude(self, *args, **kwargs):
+        """Return a QuerySet excluding Q objects and kwargs"""
+        return self.get_queryset().exclude(*args, **kwargs)
 
     async def get(self, **kwargs):
         """Get a single object"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.get(**kwargs)
-        return self._to_django(result)
+        db = self._db_for_read()
+        if self._cache_ttl and not active_aliases():
+            return await self._cached_get('get', db, kwargs)
+        return await self._get('get', db, kwargs)
 
     async def get_or_none(self, **kwargs):
         """Get a single object or None"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.get_or_none(**kwargs)
-        return self._to_django(result)
+        db = self._db_for_read()
+        if self._cache_ttl and not active_aliases():
+            return await self._cached_get('get_or_none', db, kwargs)
+        return await self._get('get_or_none', db, kwargs)
 
     async def create(self, **kwargs):
         """Create a new object"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.create(**kwargs)
-        return self._to_django(result)
+        db = self._db_for_write()
+        result = await self.tortoise_model.create(using_db=db, **self._to_tortoise_kwargs(kwargs))
+        await self._cache.invalidate()
+        return self._to_django(result, db)
 
     async def get_or_create(self, defaults=None, **kwargs):
         """Get or create an object"""
-        await self._ensure_initialized()
+        db = self._db_for_write()
         result, created = await self.tortoise_model.get_or_create(
-            defaults=defaults, **kwargs
+            defaults=self._to_tortoise_kwargs(defaults), using_db=db, **self._to_tortoise_kwargs(kwargs)
         )
-        return self._to_django(result), created
+        if created:
+            await self._cache.invalidate()
+        return self._to_django(result, db), created
 
     async def update_or_create(self, defaults=None, **kwargs):
         """Update or create an object"""
-        await self._ensure_initialized()
+        db = self._db_for_write()
         result, created = await self.tortoise_model.update_or_create(
-            defaults=defaults, **kwargs
+            defaults=self._to_tortoise_kwargs(defaults), using_db=db, **self._to_tortoise_kwargs(kwargs)
         )
-        return self._to_django(result), created
+        await self._cache.invalidate()
+        return self._to_django(result, db), created
 
-    async def bulk_create(self, objects, batch_size=None):
-        """Bulk create objects"""
-        await self._ensure_initialized()
+    def _to_tortoise_kwargs(self, kwargs):
+        """Field values keyed the Tortoise way, related Django instances given by their key"""
+        if kwargs is None:
+            return None
+        return self._expressions.convert_update(kwargs)
+
+    async def bulk_create(self, objects, batch_size=None, concurrency=1, atomic=False):
+        """
+        Bulk create objects and return them in the input order.
+
+        With batch_size, up to `concurrency` batches are inserted at once, each over its own
+        pooled connection. atomic=True inserts every batch inside a single transaction instead,
+        one after another on one connection.
+
+        On PostgreSQL and SQLite 3.35+ each batch is one multi-row INSERT ... RETURNING, which
+        sets the primary keys of the returned objects. Other backends leave them unset, and the
+        objects marked as adding, since a later asave() would insert them again.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1.')
+        objects = list(objects)
 
         # Convert Django objects to Tortoise objects
         tortoise_objs = []
         for obj in objects:
             data = {}
             for field in self.django_model._meta.fields:
-                if hasattr(obj, field.name) and not field.primary_key:
-                    value = getattr(obj, field.name)
+                if hasattr(obj, field.attname) and not field.primary_key:
+                    # pre_save fills auto_now/auto_now_add on obj like Django's bulk_create does
+                    value = field.pre_save(obj, add=True)
                     if value is not None:
-                        data[field.name] = value
+                        data[field.attname] = value
             tortoise_objs.append(self.tortoise_model(**data))
 
-        # Bulk create
-        if batch_size:
-            created = []
-            for i in range(0, len(tortoise_objs), batch_size):
-                batch = tortoise_objs[i:i + batch_size]
-                batch_created = await self.tortoise_model.bulk_create(batch)
-                created.extend(batch_created)
+        db = self._db_for_write()
+        returns_pks = _can_return_rows(db)
+        if returns_pks:
+            # Keep every multi-row INSERT under the driver's bind parameter limit
+            columns = len(self._get_insert_fields())
+            max_batch_size = max(MAX_QUERY_PARAMS.get(db.capabilities.dialect, 999) // columns, 1)
+            batch_size = min(batch_size or max_batch_size, max_batch_size)
+        batch_size = batch_size or len(tortoise_objs) or 1
+
+        async def create(start, connection):
+            batch = tortoise_objs[start:start + batch_size]
+            if not returns_pks:
+                await self.tortoise_model.bulk_create(batch, using_db=connection)
+                return
+            pks = await self._insert_returning_pks(connection, batch)
+            for obj, pk in zip(objects[start:start + batch_size], pks):
+                obj.pk = pk
+
+        starts = range(0, len(tortoise_objs), batch_size)
+        if atomic:
+            async with in_transaction(db.connection_name) as connection:
+                for start in starts:
+                    await create(start, connection)
         else:
-            created = await self.tortoise_model.bulk_create(tortoise_objs)
+            semaphore = asyncio.Semaphore(concurrency)
 
-        return self._to_django_list(created)
+            async def create_concurrently(start):
+                async with semaphore:
+                    await create(start, db)
 
-    async def bulk_update(self, objects, fields, batch_size=None):
-        """Bulk update objects"""
-        await self._ensure_initialized()
+            await asyncio.gather(*(create_concurrently(start) for start in starts))
+        await self._cache.invalidate()
 
-        # Convert to Tortoise format and update
         for obj in objects:
-            update_data = {}
-            for field_name in fields:
-                if hasattr(obj, field_name):
-                    update_data[field_name] = getattr(obj, field_name)
+            obj._state.db = db.connection_name
+            if returns_pks:
+                obj._state.adding = False
+                obj._set_loaded_values(obj._get_current_values())
+        return objects
+
+    def _get_insert_fields(self):
+        """Names of the Tortoise fields an INSERT writes, every one but database generated keys"""
+        meta = self.tortoise_model._meta
+        return [name for name in meta.fields_db_projection if not meta.fields_map[name].generated]
+
+    async def _insert_returning_pks(self, db, objects):
+        """Insert Tortoise objects with one multi-row INSERT, return their primary keys in order"""
+        meta = self.tortoise_model._meta
+        names = self._get_insert_fields()
+        query = db.query_class.into(meta.basetable).columns(
+            *[meta.fields_db_projection[name] for name in names]
+        )
+        for obj in objects:
+            query = query.insert(*[
+                query._wrapper_cls(meta.fields_map[name].to_db_value(getattr(obj, name), obj))
+                for name in names
+            ])
+        query = query.returning(meta.db_pk_column)
+
+        _, rows = await db.execute_query(*query.get_parameterized_sql())
+        pk_field = meta.fields_map[meta.pk_attr]
+        return [pk_field.to_python_value(row[meta.db_pk_column]) for row in rows]
+
+    async def acopy_from(self, objects, fields=None, batch_size=None):
+        """
+        Bulk load objects, from an iterable or an async iterable, and return the inserted row count.
+
+        Streams rows with COPY (asyncpg's copy_records_to_table) on PostgreSQL and falls back
+        to multi-row INSERTs of batch_size rows on SQLite/MySQL. Instances are not returned,
+        nor are their primary keys set.
+        """
+        meta = self.tortoise_model._meta
+        if fields is None:
+            fields = [
+                field.attname for field in self.django_model._meta.concrete_fields
+                if not field.primary_key and field.attname in meta.fields_map
+            ]
+        django_fields = [self.django_model._meta.get_field(name) for name in fields]
+        # Relations are written through their key column
+        fields = [field.attname for field in django_fields]
+        tortoise_fields = [meta.fields_map[name] for name in fields]
+        columns = [meta.fields_db_projection[name] for name in fields]
+
+        def to_record(obj):
+            # pre_save fills auto_now/auto_now_add like Django's bulk_create does
+            return tuple(
+                tortoise_field.to_db_value(django_field.pre_save(obj, add=True), obj)
+                for django_field, tortoise_field in zip(django_fields, tortoise_fields)
+            )
 
-            if obj.pk:
-                await self.tortoise_model.filter(pk=obj.pk).update(**update_data)
+        db = self._db_for_write()
+        if _is_asyncpg(db):
+            async def records():
+                async for obj in _aiter(objects):
+                    yield to_record(obj)
+
+            async with db.acquire_connection() as connection:
+                status = await connection.copy_records_to_table(
+                    meta.db_table, records=records(), columns=columns, schema_name=meta.schema
+                )
+            await self._cache.invalidate()
+            return int(status.split()[-1])
+
+        max_batch_size = max(MAX_QUERY_PARAMS.get(db.capabilities.dialect, 999) // len(columns), 1)
+        batch_size = min(batch_size or max_batch_size, max_batch_size)
+
+        inserted = 0
+        batch = []
+        async for obj in _aiter(objects):
+            batch.append(to_record(obj))
+            if len(batch) >= batch_size:
+                inserted += await self._insert_records(db, columns, batch)
+                batch = []
+        if batch:
+            inserted += await self._insert_records(db, columns, batch)
+        await self._cache.invalidate()
+        return inserted
+
+    async def _insert_records(self, db, columns, records):
+        """Insert records with a single multi-row INSERT"""
+        table = self.tortoise_model._meta.basetable
+        query = db.query_class.into(table).columns(*columns)
+        for record in records:
+            query = query.insert(*[query._wrapper_cls(value) for value in record])
+        await db.execute_query(*query.get_parameterized_sql())
+        return len(records)
 
-        return len(objects)
+    async def bulk_update(self, objects, fields, batch_size=None):
+        """Bulk update objects with a single UPDATE per batch, return the affected row count"""
+        objects = [obj for obj in objects if obj.pk is not None]
+        if not objects or not fields:
+            return 0
+
+        # Relations are written through their key column
+        fields = [self.django_model._meta.get_field(name).attname for name in fields]
+
+        db = self._db_for_write()
+        dialect = db.capabilities.dialect
+        if dialect == 'postgres':
+            make_query = self._bulk_update_values_query
+            params_per_object = len(fields) + 1
+        else:
+            make_query = self._bulk_update_case_query
+            params_per_object = 2 * len(fields) + 1
+
+        # Keep every statement under the driver's bind parameter limit
+        max_batch_size = max(MAX_QUERY_PARAMS.get(dialect, 999) // params_per_object, 1)
+        batch_size = min(batch_size or max_batch_size, max_batch_size)
+
+        updated = 0
+        for start in range(0, len(objects), batch_size):
+            sql, params = make_query(db, objects[start:start + batch_size], fields)
+            updated += (await db.execute_query(sql, params))[0]
+        await self._cache.invalidate()
+        return updated
+
+    def _bulk_update_values_query(self, db, objects, fields):
+        """Build UPDATE ... FROM (VALUES ...) joined on the primary key, for PostgreSQL"""
+        meta = self.tortoise_model._meta
+        field_objects = [meta.fields_map[meta.pk_attr]] + [meta.fields_map[name] for name in fields]
+        columns = [meta.db_pk_column] + [meta.fields_db_projection[name] for name in fields]
+        casts = [field.get_for_dialect('postgres', 'SQL_TYPE') for field in field_objects]
+
+        params = []
+        rows = []
+        for obj in objects:
+            placeholders = []
+            values = [obj.pk] + [getattr(obj, name) for name in fields]
+            for field, cast, value in zip(field_objects, casts, values):
+                params.append(field.to_db_value(value, obj))
+                placeholders.append(f'${len(params)}::{cast}')
+            rows.append(f"({', '.join(placeholders)})")
+
+        table = f'"{meta.db_table}"'
+        if meta.schema:
+            table = f'"{meta.schema}".{table}'
+        pk_column = columns[0]
+        assignments = ', '.join(f'"{column}" = "v"."{column}"' for column in columns[1:])
+        column_list = ', '.join(f'"{column}"' for column in columns)
+
+        sql = (
+            f'UPDATE {table} AS "t" SET {assignments} '
+            f'FROM (VALUES {", ".join(rows)}) AS "v" ({column_list}) '
+            f'WHERE "t"."{pk_column}" = "v"."{pk_column}"'
+        )
+        return sql, params
+
+    def _bulk_update_case_query(self, db, objects, fields):
+        """Build UPDATE ... SET col = CASE pk WHEN ... END WHERE pk IN (...), for SQLite/MySQL"""
+        meta = self.tortoise_model._meta
+        table = meta.basetable
+        pk = table[meta.db_pk_column]
+        pk_field = meta.fields_map[meta.pk_attr]
+
+        query = db.query_class.update(table)
+        pk_values = [pk_field.to_db_value(obj.pk, obj) for obj in objects]
+        for name in fields:
+            field = meta.fields_map[name]
+            case = Case()
+            for obj, pk_value in zip(objects, pk_values):
+                value = field.to_db_value(getattr(obj, name), obj)
+                case = case.when(pk == query._wrapper_cls(pk_value), query._wrapper_cls(value))
+            query = query.set(table[meta.fields_db_projection[name]], case)
+
+        query = query.where(pk.isin([query._wrapper_cls(value) for value in pk_values]))
+        return query.get_parameterized_sql()
 
     async def count(self):
         """Count all objects"""
-        await self._ensure_initialized()
-        return await self.tortoise_model.all().count()
+        return await self.tortoise_model.all(using_db=self._db_for_read()).count()
 
     async def exists(self, **kwargs):
         """Check if objects exist"""
-        await self._ensure_initialized()
+        queryset = self.tortoise_model.all(using_db=self._db_for_read())
         if kwargs:
-            return await self.tortoise_model.filter(**kwargs).exists()
-        return await self.tortoise_model.all().exists()
+            return await queryset.filter(**kwargs).exists()
+        return await queryset.exists()
 
-    async def aggregate(self, **kwargs):
-        """Aggregate functions"""
-        await self._ensure_initialized()
-        return await self.tortoise_model.all().aggregate(**kwargs)
+    async def aggregate(self, *args, **kwargs):
+        """Aggregate over all objects"""
+        return await self.get_queryset().aggregate(*args, **kwargs)
 
     async def first(self):
         """Get first object"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.all().first()
-        return self._to_django(result)
+        return await self.get_queryset().first()
 
     async def last(self):
         """Get last object"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.all().order_by('-id').first()
-        return self._to_django(result)
+        return await self.get_queryset().last()
 
-    async def earliest(self, field_name):
-        """Get earliest object by field"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.all().order_by(field_name).first()
-        return self._to_django(result)
+    async def earliest(self, *fields):
+        """Get earliest object by fields, or Meta.get_latest_by"""
+        return await self.get_queryset().earliest(*fields)
 
-    async def latest(self, field_name):
-        """Get latest object by field"""
-        await self._ensure_initialized()
-        result = await self.tortoise_model.all().order_by(f'-{field_name}').first()
-        return self._to_django(result)
+    async def latest(self, *fields):
+        """Get latest object by fields, or Meta.get_latest_by"""
+        return await self.get_queryset().latest(*fields)
 
     async def in_bulk(self, id_list=None, field_name='pk'):
         """Get objects in bulk by IDs"""
-        await self._ensure_initialized()
-
+        db = self._db_for_read()
+        queryset = self.tortoise_model.all(using_db=db)
         if id_list:
-            filter_kwargs = {f'{field_name}__in': id_list}
-            results = await self.tortoise_model.filter(**filter_kwargs)
+            # Stay under the driver's bind parameter limit
+            id_list = list(id_list)
+            batch_size = MAX_QUERY_PARAMS.get(db.capabilities.dialect, 999)
+            results = []
+            for start in range(0, len(id_list), batch_size):
+                filter_kwargs = {f'{field_name}__in': id_list[start:start + batch_size]}
+                results.extend(await queryset.filter(**filter_kwargs))
         else:
-            results = await self.tortoise_model.all()
+            results = await queryset
 
         # Return dict mapping field values to objects
         return {
-            getattr(obj, field_name): self._to_django(obj)
+            getattr(obj, field_name): self._to_django(obj, db)
             for obj in results
         }
 
     async def delete(self):
         """Delete all objects"""
-        await self._ensure_initialized()
-        return await self.tortoise_model.all().delete()
+        deleted = await self.tortoise_model.all(using_db=self._db_for_write()).delete()
+        await self._cache.invalidate()
+        return deleted
 
     async def update(self, **kwargs):
-        """Update all objects"""
-        await self._ensure_initialized()
-        return await self.tortoise_model.all().update(**kwargs)
+        """Update all objects, F expressions are computed by the database"""
+        return await self.get_queryset().update(**kwargs)
+
+    def aiterator(self, chunk_size=2000):
+        """Stream all objects in chunks of chunk_size"""
+        return self.get_queryset().aiterator(chunk_size)
+
+    def direct(self):
+        """Return a QuerySet that builds Django instances straight from driver records"""
+        return self.get_queryset().direct()
 
     def order_by(self, *fields):
         """Return a QuerySet ordered by fields"""
-        return RaphaelQuerySet(self, self.tortoise_model.all().order_by(*fields))
+        return self.get_queryset().order_by(*fields)
+
+    def select_related(self, *fields):
+        """Return a QuerySet loading forward relations with JOINs"""
+        return self.get_queryset().select_related(*fields)
+
+    def prefetch_related(self, *lookups):
+        """Return a QuerySet loading relations with one batched query each"""
+        return self.get_queryset().prefetch_related(*lookups)
+
+    def select_for_update(self, nowait=False, skip_locked=False, of=(), no_key=False):
+        """Return a QuerySet locking the selected rows, inside atomic()"""
+        return self.get_queryset().select_for_update(nowait=nowait, skip_locked=skip_locked, of=of, no_key=no_key)
+
+    def only(self, *fields):
+        """Return a QuerySet loading only these fields"""
+        return self.get_queryset().only(*fields)
+
+    def defer(self, *fields):
+        """Return a QuerySet leaving these fields out"""
+        return self.get_queryset().defer(*fields)
+
+    def annotate(self, *args, **kwargs):
+        """Return a QuerySet annotating every object"""
+        return self.get_queryset().annotate(*args, **kwargs)
 
     def values(self, *fields):
         """Return a QuerySet that returns dictionaries"""
-        return RaphaelQuerySet(self, self.tortoise_model.all().values(*fields))
+        return self.get_queryset().values(*fields)
 
-    def values_list(self, *fields, flat=False):
+    def values_list(self, *fields, flat=False, named=False):
         """Return a QuerySet that returns tuples"""
-        return RaphaelQuerySet(self, self.tortoise_model.all().values_list(*fields, flat=flat))
+        return self.get_queryset().values_list(*fields, flat=flat, named=named)
+
+
+class Page(NamedTuple):
+    """A page of keyset pagination, next_cursor is None on the last page"""
+    objects: list
+    next_cursor: Optional[str]
 
 
 class RaphaelQuerySet:
-    """Async QuerySet wrapper for chaining operations"""
+    """
+    Lazy, immutable async QuerySet.
 
-    def __init__(self, manager, queryset):
+    Every chaining method returns a clone sharing the immutable query state of its parent,
+    nothing is executed until the QuerySet is awaited, iterated or a terminal method runs.
+
+    Usage:
+        books = await Book.aobjects.filter(author="John").order_by("-price")[:10]
+    """
+
+    def __init__(self, manager):
         self.manager = manager
-        self.queryset = queryset
+        self._db = manager._db
+        self._filters = ()
+        self._orderings = ()
+        self._limit = None
+        self._offset = None
+        self._direct = False
+        self._values = None
+        self._select_related = ()
+        self._prefetch_related = ()
+        # (nowait, skip_locked, of, no_key) of select_for_update()
+        self._for_update = None
+        # (name, Django expression) pairs, and the values() fields aggregates group by
+        self._annotations = ()
+        self._group_by = None
+        # (field names, defer) like Django's Query.deferred_loading
+        self._deferred_loading = (frozenset(), True)
+
+    def _clone(self, **changes):
+        """Return a copy of this QuerySet with some of its state replaced"""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.__dict__.update(changes)
+        return clone
+
+    async def _build(self, for_write=False):
+        """Build the Tortoise QuerySet matching the current state, bound to its connection"""
+        tortoise_model = self.manager.tortoise_model or await self.manager._ensure_initialized()
+
+        if self._db is not None:
+            db = connections.get(self._db)
+        elif for_write:
+            db = self.manager._db_for_write()
+        else:
+            db = self.manager._db_for_read()
+
+        queryset = tortoise_model.all(using_db=db)
+        if self._annotations:
+            convert = self.manager._expressions.convert
+            queryset = queryset.annotate(**{name: convert(expr) for name, expr in self._annotations})
+        if self._group_by is not None:
+            queryset = queryset.group_by(*self._get_lookups(self._group_by))
+        convert_filter = self.manager._expressions.convert_filter
+        for negate, args, kwargs in self._filters:
+            if not args and not kwargs:
+                continue
+            q = convert_filter(args, kwargs)
+            queryset = queryset.filter(~q if negate else q)
+        if self._orderings:
+            queryset = queryset.order_by(*self._resolve_orderings(self._orderings))
+        if self._limit is not None:
+            queryset = queryset.limit(self._limit)
+        if self._offset is not None:
+            queryset = queryset.offset(self._offset)
+        attnames = self._get_loaded_attnames()
+        if attnames is not None and self._values is None:
+            if self._select_related:
+                raise ValueError('only()/defer() cannot be combined with select_related()')
+            queryset = queryset.only(*attnames)
+        if self._select_related and self._values is None:
+            queryset = queryset.select_related(*self._select_related)
+        if self._prefetch_related and self._values is None:
+            queryset = queryset.prefetch_related(*self._prefetch_related)
+        if self._for_update is not None and not for_write:
+            nowait, skip_locked, of, no_key = self._for_update
+            lock_tables = self._get_lock_tables(of)
+            # SQLite has no row locks, like Django the clause is left out there
+            if db.capabilities.support_for_update:
+                if db.connection_name not in active_aliases():
+                    raise TransactionManagementError('select_for_update cannot be used outside of a transaction.')
+                queryset = queryset.select_for_update(
+                    nowait=nowait, skip_locked=skip_locked, of=lock_tables, no_key=no_key
+                )
+        return queryset
+
+    async def _related_tree(self):
+        """Nested dict of the select/prefetch lookups, with their managers ready"""
+        tree = {}
+        for lookup in (*self._select_related, *self._prefetch_related):
+            node = tree
+            for name in lookup.split('__'):
+                node = node.setdefault(name, {})
+        await self.manager._ensure_related(tree)
+        return tree
+
+    def _to_django_list(self, results, db, tree):
+        """Convert Tortoise objects, and the relations they loaded, to Django instances"""
+        builder = self._get_builder()
+        if not tree:
+            build = partial(builder.build, db=db.connection_name)
+        else:
+            build = partial(
+                self.manager._build_with_related, tree=tree, alias=db.connection_name, builder=builder
+            )
+        return [build(obj) for obj in results]
 
-    def filter(self, **kwargs):
-        """Filter the queryset"""
-        self.queryset = self.queryset.filter(**kwargs)
-        return self
+    def _get_loaded_attnames(self):
+        """Attnames only()/defer() leave to load, None when every field is loaded"""
+        names, defer = self._deferred_loading
+        if defer and not names:
+            return None
 
-    def exclude(self, **kwargs):
+        opts = self.manager.django_model._meta
+        fields = {opts.pk if name == 'pk' else opts.get_field(name) for name in names}
+        if defer:
+            attnames = [f.attname for f in opts.concrete_fields if f not in fields or f.primary_key]
+        else:
+            attnames = [f.attname for f in opts.concrete_fields if f in fields or f.primary_key]
+        fields_map = self.manager.tortoise_model._meta.fields_map
+        return [attname for attname in attnames if attname in fields_map]
+
+    def _get_builder(self):
+        """InstanceBuilder matching the fields and annotations the queryset loads"""
+        attnames = self._get_loaded_attnames()
+        builder = self.manager._builder if attnames is None else self.manager._builder.only(attnames)
+        if self._annotations:
+            to_python = self.manager._expressions.to_python
+            builder = builder.annotate([(name, to_python(expr)) for name, expr in self._annotations])
+        return builder
+
+    def _resolve_orderings(self, orderings):
+        """Tortoise names of the orderings: pk and relations by their key, reverse relations by accessor"""
+        resolve_name = self.manager._expressions.resolve_name
+        resolved = []
+        for ordering in orderings:
+            prefix = '-' if ordering.startswith('-') else ''
+            resolved.append(prefix + resolve_name(ordering[len(prefix):]))
+        return resolved
+
+    def all(self):
+        """Return a copy of the queryset"""
+        return self._clone()
+
+    def using(self, alias):
+        """Run the queryset on the database alias, bypassing the routers"""
+        return self._clone(_db=alias)
+
+    def filter(self, *args, **kwargs):
+        """
+        Filter the queryset with Django lookups, Q objects and F expressions.
+
+        Usage:
+            Book.aobjects.filter(Q(author="x") | ~Q(price__gte=F("cost") * 2))
+        """
+        return self._clone(_filters=self._filters + ((False, args, kwargs),))
+
+    def exclude(self, *args, **kwargs):
         """Exclude from the queryset"""
-        self.queryset = self.queryset.exclude(**kwargs)
-        return self
+        return self._clone(_filters=self._filters + ((True, args, kwargs),))
 
     def order_by(self, *fields):
         """Order the queryset"""
-        self.queryset = self.queryset.order_by(*fields)
-        return self
+        return self._clone(_orderings=fields)
+
+    def direct(self):
+        """Build Django instances straight from driver records, without Tortoise objects"""
+        return self._clone(_direct=True)
+
+    def only(self, *fields):
+        """Load only these fields, the others are deferred on the returned instances"""
+        names, defer = self._deferred_loading
+        if defer:
+            return self._clone(_deferred_loading=(frozenset(fields) - names, False))
+        return self._clone(_deferred_loading=(frozenset(fields), False))
+
+    def defer(self, *fields):
+        """Leave these fields out of the SELECT, they are deferred on the returned instances"""
+        names, defer = self._deferred_loading
+        if fields == (None,):
+            return self._clone(_deferred_loading=(frozenset(), True))
+        if defer:
+            return self._clone(_deferred_loading=(names | frozenset(fields), True))
+        return self._clone(_deferred_loading=(names - frozenset(fields), False))
+
+    def select_related(self, *fields):
+        """Load forward ForeignKey/OneToOne relations, and reverse OneToOne ones, with JOINs"""
+        return self._clone(_select_related=self._select_related + fields)
+
+    def select_for_update(self, nowait=False, skip_locked=False, of=(), no_key=False):
+        """
+        Lock the selected rows until the end of the atomic() block.
+
+        Queue workers claim rows without waiting on each other with skip_locked:
+            async with atomic():
+                jobs = await Job.aobjects.filter(done=False).select_for_update(skip_locked=True)[:10]
+        """
+        if nowait and skip_locked:
+            raise ValueError('The nowait option cannot be used with skip_locked.')
+        return self._clone(_for_update=(nowait, skip_locked, tuple(of), no_key))
+
+    def _get_lock_tables(self, of):
+        """
+        Tables to lock for select_for_update(of=...), 'self' being the model.
+
+        Like Django, relations must be followed by select_related(); they are locked under
+        the alias Tortoise joins them with, like relapp_novel__author.
+        """
+        table = self.manager.tortoise_model._meta.db_table
+        followed = {'self'}
+        for lookup in self._select_related:
+            parts = lookup.split('__')
+            followed.update('__'.join(parts[:index]) for index in range(1, len(parts) + 1))
+
+        invalid = [name for name in of if name not in followed]
+        if invalid:
+            raise FieldError(
+                'Invalid field name(s) given in select_for_update(of=(...)): %s. Only relational '
+                'fields followed in the query are allowed. Choices are: %s.'
+                % (', '.join(invalid), ', '.join(sorted(followed)))
+            )
+        return [table if name == 'self' else f'{table}__{name}' for name in of]
+
+    def prefetch_related(self, *lookups):
+        """Load relations, many-to-many and reverse ones included, with one IN query each"""
+        return self._clone(_prefetch_related=self._prefetch_related + lookups)
+
+    def values(self, *fields):
+        """Return dictionaries instead of model instances"""
+        return self._clone(_values=('dict', fields))
+
+    def values_list(self, *fields, flat=False, named=False):
+        """Return tuples, named tuples with named=True or single values with flat=True"""
+        if flat and named:
+            raise TypeError("'flat' and 'named' can't be used together.")
+        if flat and len(fields) > 1:
+            raise TypeError("'flat' is not valid when values_list is called with more than one field.")
+        kind = 'flat' if flat else 'named' if named else 'tuple'
+        return self._clone(_values=(kind, fields))
+
+    def _values_row_factory(self, queryset):
+        """
+        Return the Tortoise lookups values()/values_list() select and the function turning
+        each driver record into a dict, tuple, named tuple or single value.
+        """
+        kind, names = self._values
+        meta = self.manager.tortoise_model._meta
+        annotations = dict(self._annotations)
+
+        lookups = self._get_lookups(names)
+        if not names:
+            names = lookups = lookups + list(annotations)
+
+        # Only columns the driver doesn't already decode need a converter, annotations are
+        # converted to the type Django would return
+        values_query = queryset.values_list(*lookups)
+        native = {attname for _, attname, _ in meta.db_native_fields}
+        converters = [
+            self.manager._expressions.to_python(annotations[lookup]) if lookup in annotations
+            else None if lookup in native
+            else values_query.resolve_to_python_value(self.manager.tortoise_model, lookup)
+            for lookup in lookups
+        ]
+
+        # Tortoise aliases the selected columns by position
+        getter = itemgetter(*[str(index) for index in range(len(lookups))])
+        get = (lambda record: (getter(record),)) if len(lookups) == 1 else getter
+        if any(converters):
+            get_raw = get
+
+            def get(record):
+                return tuple(
+                    value if convert is None or value is None else convert(value)
+                    for convert, value in zip(converters, get_raw(record))
+                )
+
+        if kind == 'flat':
+            return lookups, lambda record: get(record)[0]
+        if kind == 'tuple':
+            return lookups, get
+        if kind == 'named':
+            row_class = create_namedtuple_class(*names)
+            return lookups, lambda record: row_class._make(get(record))
+        return lookups, lambda record: dict(zip(names, get(record)))
+
+    def _get_lookups(self, names):
+        """Tortoise lookups of values() fields, every concrete field when there are none"""
+        opts = self.manager.django_model._meta
+        if not names:
+            fields_map = self.manager.tortoise_model._meta.fields_map
+            return [field.attname for field in opts.concrete_fields if field.attname in fields_map]
+
+        lookups = []
+        for name in names:
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                # Lookups spanning relations, like author__name, and annotations
+                lookups.append(name)
+                continue
+            # A ForeignKey gives its key, like in Django
+            lookups.append(field.attname if field.concrete else name)
+        return lookups
+
+    def annotate(self, *args, **kwargs):
+        """
+        Add expressions or aggregates to every result.
+
+        After values(), aggregates group the rows by the values() fields:
+            await Book.aobjects.values("author").annotate(avg=Avg("price"))
+        """
+        annotations = _with_default_aliases(args, kwargs)
+        changes = {'_annotations': self._annotations + tuple(annotations.items())}
+        if self._values is not None:
+            kind, fields = self._values
+            if self._group_by is None and any(map(contains_aggregate, annotations.values())):
+                changes['_group_by'] = fields
+            if fields:
+                changes['_values'] = (kind, fields + tuple(annotations))
+        return self._clone(**changes)
+
+    async def aggregate(self, *args, **kwargs):
+        """
+        Compute aggregates over the queryset in SQL and return them in a dict.
+
+        Usage:
+            await Book.aobjects.filter(in_stock=True).aggregate(Avg("price"), total=Count("id"))
+        """
+        aggregates = _with_default_aliases(args, kwargs)
+        if self._limit is not None or self._offset is not None:
+            raise TypeError('Cannot aggregate a sliced queryset.')
+
+        base = self._clone(
+            _orderings=(), _values=None, _group_by=None, _select_related=(),
+            _prefetch_related=(), _deferred_loading=(frozenset(), True),
+        )
+        queryset = await base._build()
+        expressions = self.manager._expressions
+        names = list(aggregates)
+        queryset = queryset.annotate(**{name: expressions.convert(expr) for name, expr in aggregates.items()})
+
+        record, = await self.manager._fetch_records(queryset.values_list(*names))
+        result = {}
+        for index, name in enumerate(names):
+            value = record[str(index)]
+            convert = expressions.to_python(aggregates[name])
+            result[name] = value if convert is None or value is None else convert(value)
+        return result
 
     def limit(self, n):
         """Limit the queryset"""
-        self.queryset = self.queryset.limit(n)
-        return self
+        return self._clone(_limit=n)
 
     def offset(self, n):
         """Offset the queryset"""
-        self.queryset = self.queryset.offset(n)
-        return self
+        return self._clone(_offset=n)
+
+    def __getitem__(self, key):
+        """Slice the queryset into LIMIT/OFFSET, or fetch a single object by index"""
+        if isinstance(key, int):
+            if key < 0:
+                raise ValueError('Negative indexing is not supported.')
+            return self._get_item(key)
+        if not isinstance(key, slice):
+            raise TypeError(f'QuerySet indices must be integers or slices, not {type(key).__name__}.')
+        if key.step is not None:
+            raise ValueError('Slicing with a step is not supported.')
+
+        start = key.start or 0
+        if start < 0 or (key.stop is not None and key.stop < 0):
+            raise ValueError('Negative indexing is not supported.')
+
+        # Slices compose with the current window, like Django's set_limits
+        offset = (self._offset or 0) + start
+        limit = self._limit - start if self._limit is not None else None
+        if key.stop is not None:
+            stop = max(key.stop - start, 0)
+            limit = stop if limit is None else min(limit, stop)
+        if limit is not None:
+            limit = max(limit, 0)
+        return self._clone(_limit=limit, _offset=offset or None)
+
+    async def _get_item(self, index):
+        results = await self[index:index + 1]
+        if not results:
+            raise IndexError('QuerySet index out of range')
+        return results[0]
+
+    def __await__(self):
+        return self._fetch_all().__await__()
+
+    def _is_empty(self):
+        """Whether the queryset is sliced to no rows, Tortoise reads limit(0) as no limit"""
+        return self._limit == 0
+
+    async def _fetch_all(self):
+        """Execute the queryset and return the list of results"""
+        if self._is_empty():
+            return []
+        queryset = await self._build()
+
+        if self._values is not None:
+            lookups, make_row = self._values_row_factory(queryset)
+            records = await self.manager._fetch_records(queryset.values_list(*lookups))
+            return [make_row(record) for record in records]
+
+        # Related objects are only loaded through Tortoise objects
+        tree = await self._related_tree()
+        if not tree and (self._direct or self.manager._coalesce):
+            records = await self.manager._fetch_records(queryset)
+            build = partial(self._get_builder().build_from_record, db=queryset._db.connection_name)
+            return [build(record) for record in records]
+        results = await queryset
+        return self._to_django_list(results, queryset._db, tree)
 
-    async def all(self):
-        """Execute and return all results"""
-        await self.manager._ensure_initialized()
-        results = await self.queryset
-        return self.manager._to_django_list(results)
+    async def get(self, **kwargs):
+        """Get a single object matching the queryset and kwargs"""
+        if self._values is not None:
+            rows = await self.filter(**kwargs)[:2]
+            if len(rows) > 1:
+                raise MultipleObjectsReturned(self.manager.tortoise_model)
+            if not rows:
+                raise DoesNotExist(self.manager.tortoise_model)
+            return rows[0]
+
+        if self._is_empty():
+            raise DoesNotExist(self.manager.tortoise_model)
+        queryset = await self._build()
+        tree = await self._related_tree()
+        if not tree and self.manager._coalesce:
+            return await self.manager._get_from_records(
+                'get', queryset.filter(**kwargs), self._get_builder()
+            )
+        result = await queryset.get(**kwargs)
+        return self._to_django_list([result], queryset._db, tree)[0]
+
+    async def get_or_none(self, **kwargs):
+        """Get a single object matching the queryset and kwargs, or None"""
+        if self._is_empty():
+            return None
+        queryset = await self._build()
+        tree = await self._related_tree()
+        if not tree and self.manager._coalesce:
+            return await self.manager._get_from_records(
+                'get_or_none', queryset.filter(**kwargs), self._get_builder()
+            )
+        result = await queryset.get_or_none(**kwargs)
+        if result is None:
+            return None
+        return self._to_django_list([result], queryset._db, tree)[0]
+
+    def _get_ordering(self):
+        """Ordering of the queryset, else Meta.ordering, else the primary key"""
+        if self._orderings:
+            return list(self._orderings)
+        ordering = [o for o in self.manager.django_model._meta.ordering if isinstance(o, str)]
+        return ordering or ['pk']
 
     async def first(self):
-        """Get first result"""
-        await self.manager._ensure_initialized()
-        result = await self.queryset.first()
-        return self.manager._to_django(result)
+        """Get first result, in Meta.ordering or primary key order when the queryset isn't ordered"""
+        if not self._orderings:
+            return await self.order_by(*self._get_ordering())._first()
+        return await self._first()
 
     async def last(self):
-        """Get last result"""
+        """Get last result, reversing the ordering so only one row is read"""
+        if self._limit is not None or self._offset is not None:
+            # Reversing would select another window, a slice is bounded anyway
+            results = await self
+            return results[-1] if results else None
+        return await self.order_by(*_reverse_ordering(self._get_ordering()))._first()
+
+    async def earliest(self, *fields):
+        """Get the first result ordered by fields, or Meta.get_latest_by"""
+        return await self._earliest(fields, reverse=False)
+
+    async def latest(self, *fields):
+        """Get the last result ordered by fields, or Meta.get_latest_by"""
+        return await self._earliest(fields, reverse=True)
+
+    async def _earliest(self, fields, reverse):
+        if not fields:
+            get_latest_by = self.manager.django_model._meta.get_latest_by
+            if get_latest_by is None:
+                raise ValueError(
+                    "earliest() and latest() require either fields as positional arguments "
+                    "or 'get_latest_by' in the model's Meta."
+                )
+            fields = (get_latest_by,) if isinstance(get_latest_by, str) else tuple(get_latest_by)
+        if self._limit is not None or self._offset is not None:
+            raise TypeError('Cannot change a query once a slice has been taken.')
+
+        result = await self.order_by(*(_reverse_ordering(fields) if reverse else fields))._first()
+        if result is None:
+            raise DoesNotExist(self.manager.tortoise_model)
+        return result
+
+    async def _first(self):
+        """Fetch the first row of the queryset as ordered"""
+        if self._is_empty():
+            return None
+        if self._values is not None:
+            rows = await self[:1]
+            return rows[0] if rows else None
+
+        queryset = await self._build()
+        tree = await self._related_tree()
+        if not tree and self._direct:
+            records = await self.manager._fetch_records(queryset.first())
+            if not records:
+                return None
+            return self._get_builder().build_from_record(records[0], queryset._db.connection_name)
+        result = await queryset.first()
+        if result is None:
+            return None
+        return self._to_django_list([result], queryset._db, tree)[0]
+
+    def __aiter__(self):
+        return self.aiterator()
+
+    async def aiterator(self, chunk_size=2000):
+        """
+        Stream results in chunks of chunk_size, so memory stays bounded whatever the table size.
+
+        Uses a server-side cursor on asyncpg and keyset chunking on the primary key elsewhere.
+        Querysets ordered by other fields fall back to LIMIT/OFFSET chunks.
+        """
+        if self._is_empty():
+            return
+        queryset = await self._build()
+
+        if self._values is not None:
+            tree = None
+            lookups, build = self._values_row_factory(queryset)
+            compile_chunk = partial(_values_list, lookups=lookups)
+        else:
+            tree = await self._related_tree()
+            build = partial(self._get_builder().build_from_record, db=queryset._db.connection_name)
+            compile_chunk = _identity
+
+        async def fetch(chunk):
+            if tree:
+                return self._to_django_list(await chunk, queryset._db, tree)
+            return [build(record) for record in await self.manager._fetch_records(compile_chunk(chunk))]
+
+        if not tree and _is_asyncpg(queryset._db):
+            query = compile_chunk(queryset)
+            query._make_query()
+            sql, params = query.query.get_parameterized_sql()
+            async with queryset._db.acquire_connection() as connection:
+                # asyncpg cursors only live inside a transaction
+                async with connection.transaction():
+                    async for record in connection.cursor(sql, *params, prefetch=chunk_size):
+                        yield build(record)
+            return
+
+        # A sliced queryset is already bounded
+        if self._limit is not None or self._offset is not None:
+            for obj in await fetch(queryset):
+                yield obj
+            return
+
+        # Seek past the last row of each chunk, values rows don't carry the ordering fields
+        keyset = self._get_keyset() if self._values is None else None
+        if keyset is not None:
+            source = self._with_keyset_loaded(keyset)
+            after = None
+            while True:
+                objects = await source._fetch_keyset_chunk(keyset, after, chunk_size)
+                for obj in objects:
+                    yield obj
+
+                if len(objects) < chunk_size:
+                    return
+                after = [getattr(objects[-1], field.attname) for field, _ in keyset]
+
+        if not self._orderings:
+            queryset = queryset.order_by(self.manager.tortoise_model._meta.pk_attr)
+        offset = 0
+        while True:
+            objects = await fetch(queryset.offset(offset).limit(chunk_size))
+            for obj in objects:
+                yield obj
+
+            if len(objects) < chunk_size:
+                return
+            offset += chunk_size
+
+    async def page_after(self, cursor=None, size=50):
+        """
+        Return the `size` objects following `cursor` in the queryset ordering.
+
+        Keyset pagination: pages seek past the last row with a comparison on the ordering
+        columns instead of an OFFSET, so deep pages cost the same as the first one.
+        The primary key is appended to the ordering to make it total, ordering fields
+        must not be nullable.
+
+        Usage:
+            page = await Book.aobjects.order_by("published_date", "id").page_after(cursor, size=50)
+            page.objects, page.next_cursor
+        """
+        if self._values is not None:
+            raise TypeError('page_after() cannot be used with values() or values_list().')
+        if self._limit is not None or self._offset is not None:
+            raise TypeError('Cannot paginate a sliced queryset.')
+
         await self.manager._ensure_initialized()
-        results = await self.queryset
-        if results:
-            return self.manager._to_django(results[-1])
-        return None
+        keyset = self._get_keyset()
+        if keyset is None:
+            raise ValueError('page_after() needs an ordering on non-nullable fields of the model.')
+
+        after = None if cursor is None else self._decode_cursor(keyset, cursor)
+        objects = await self._with_keyset_loaded(keyset)._fetch_keyset_chunk(keyset, after, size + 1)
+        if len(objects) <= size:
+            return Page(objects, None)
+        objects = objects[:size]
+        return Page(objects, self._encode_cursor(keyset, objects[-1]))
+
+    def _get_keyset(self):
+        """
+        (field, descending) pairs of the ordering with the primary key as tie-breaker,
+        or None when it orders on something else than non-nullable fields of the model.
+        """
+        opts = self.manager.django_model._meta
+        fields_map = self.manager.tortoise_model._meta.fields_map
+        keyset = []
+        for ordering in self._orderings:
+            name = ordering.lstrip('-')
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null or field.attname not in fields_map:
+                return None
+            keyset.append((field, ordering.startswith('-')))
+
+        if not any(field.primary_key for field, _ in keyset):
+            keyset.append((opts.pk, False))
+        return keyset
+
+    def _with_keyset_loaded(self, keyset):
+        """Return a clone that doesn't defer the keyset fields"""
+        names, defer = self._deferred_loading
+        keyset_names = frozenset(field.name for field, _ in keyset)
+        if defer:
+            return self._clone(_deferred_loading=(names - keyset_names, True))
+        return self._clone(_deferred_loading=(names | keyset_names, False))
+
+    def _keyset_criterion(self, keyset, values):
+        """WHERE clause selecting the rows after `values` in the keyset ordering"""
+        meta = self.manager.tortoise_model._meta
+        columns = [meta.basetable[meta.fields_db_projection[field.attname]] for field, _ in keyset]
+        params = [
+            meta.fields_map[field.attname].to_db_value(value, None)
+            for (field, _), value in zip(keyset, values)
+        ]
+
+        directions = {descending for _, descending in keyset}
+        if len(directions) == 1:
+            # One row-value comparison, which an index on the ordering columns serves directly
+            if directions == {True}:
+                return Tuple(*columns) < Tuple(*params)
+            return Tuple(*columns) > Tuple(*params)
+
+        # Mixed directions expand to (a > x) OR (a = x AND b < y) OR ...
+        criterion = None
+        for index, (column, param) in enumerate(zip(columns, params)):
+            term = column < param if keyset[index][1] else column > param
+            for previous_column, previous_param in zip(columns[:index], params[:index]):
+                term = (previous_column == previous_param) & term
+            criterion = term if criterion is None else criterion | term
+        return criterion
+
+    async def _fetch_keyset_chunk(self, keyset, after, size):
+        """Fetch `size` objects following the row whose keyset values are `after`"""
+        queryset = await self._build()
+        queryset = queryset.order_by(
+            *[f"{'-' if descending else ''}{field.attname}" for field, descending in keyset]
+        ).limit(size)
+        where = None if after is None else self._keyset_criterion(keyset, after)
+
+        tree = await self._related_tree()
+        if tree:
+            queryset._choose_db_if_not_chosen()
+            queryset._make_query()
+            if where is not None:
+                queryset.query = queryset.query.where(where)
+            return self._to_django_list(await queryset._execute(), queryset._db, tree)
+
+        records = await self.manager._fetch_records(queryset, where=where)
+        build = partial(self._get_builder().build_from_record, db=queryset._db.connection_name)
+        return [build(record) for record in records]
+
+    @staticmethod
+    def _encode_cursor(keyset, obj):
+        """Opaque cursor holding the ordering and the keyset values of the last object"""
+        # value_to_string() keeps microseconds, which JSON encoders of datetimes drop
+        payload = [
+            [f"{'-' if descending else ''}{field.attname}" for field, descending in keyset],
+            [field.value_to_string(obj) for field, _ in keyset],
+        ]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(keyset, cursor):
+        """Keyset values of a cursor, checked against the queryset ordering"""
+        try:
+            ordering, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValueError('Invalid pagination cursor.')
+        if ordering != [f"{'-' if descending else ''}{field.attname}" for field, descending in keyset]:
+            raise ValueError("The pagination cursor doesn't match the queryset ordering.")
+        return [field.to_python(value) for (field, _), value in zip(keyset, values)]
 
     async def count(self):
         """Count results"""
-        await self.manager._ensure_initialized()
-        return await self.queryset.count()
+        if self._is_empty():
+            return 0
+        queryset = await self._build()
+        return await queryset.count()
 
     async def exists(self):
         """Check if results exist"""
-        await self.manager._ensure_initialized()
-        return await self.queryset.exists()
+        if self._is_empty():
+            return False
+        queryset = await self._build()
+        if self._offset:
+            # Tortoise's EXISTS drops the OFFSET, read the first row of the window instead
+            pk = self.manager.tortoise_model._meta.pk_attr
+            return bool(await queryset.limit(1).values_list(pk, flat=True))
+        return await queryset.exists()
 
     async def delete(self):
         """Delete all matching objects"""
-        await self.manager._ensure_initialized()
-        return await self.queryset.delete()
+        queryset = await self._build(for_write=True)
+        deleted = await queryset.delete()
+        await self.manager._cache.invalidate()
+        return deleted
 
     async def update(self, **kwargs):
-        """Update all matching objects"""
-        await self.manager._ensure_initialized()
-        return await self.queryset.update(**kwargs)
+        """
+        Update all matching objects in one statement.
+
+        Usage:
+            await Book.aobjects.filter(id=1).update(stock=F("stock") - 1)
+        """
+        queryset = await self._build(for_write=True)
+        updated = await queryset.update(**self.manager._expressions.convert_update(kwargs))
+        await self.manager._cache.invalidate()
+        return updated
+
+
+async def _aiter(objects):
+    """Iterate over an iterable or an async iterable"""
+    if hasattr(objects, '__aiter__'):
+        async for obj in objects:
+            yield obj
+    else:
+        for obj in objects:
+            yield obj
+
+
+def _identity(queryset):
+    return queryset
+
+
+def _values_list(queryset, lookups):
+    return queryset.values_list(*lookups)
+
+
+def _with_default_aliases(args, kwargs):
+    """Merge positional expressions into kwargs under their default alias, like price__avg"""
+    expressions = {}
+    for arg in args:
+        try:
+            alias = arg.default_alias
+        except (AttributeError, TypeError):
+            raise TypeError('Complex aggregates require an alias')
+        expressions[alias] = arg
+    expressions.update(kwargs)
+    return expressions
+
+
+def _reverse_ordering(orderings):
+    """Flip the direction of every ordering"""
+    return [o[1:] if o.startswith('-') else f'-{o}' for o in orderings]
+
+
+def _is_asyncpg(db):
+    """Whether a Tortoise client runs on asyncpg"""
+    return type(db).__module__.startswith('tortoise.backends.asyncpg')
+
+
+def _can_return_rows(db):
+    """Whether a Tortoise client supports INSERT ... RETURNING, like Django's can_return_rows_from_bulk_insert"""
+    dialect = db.capabilities.dialect
+    if dialect == 'sqlite':
+        return sqlite3.sqlite_version_info >= (3, 35)
+    return dialect == 'postgres'
 
 
 class AsyncManagerDescriptor:
@@ -8,6 +8,11 @@ from tortoise.models import Model as TortoiseModel
 from django_raphael.managers import AsyncManagerDescriptor
 
 
+def is_hidden_relation(rel) -> bool:
+    """Whether a reverse relation has no accessor (related_name ending with '+')"""
+    return bool(rel.related_name) and rel.related_name.endswith('+')
+
+
 class TortoiseModelFactory:
     """Factory for creating Tortoise models from Django models"""
 
@@ -28,8 +33,16 @@ class TortoiseModelFactory:
         for field in django_model._meta.fields:
             name = field.name
 
+            # ForeignKey and OneToOneField
+            if field.is_relation:
+                if issubclass(field.related_model, RaphaelMixin):
+                    attrs[name] = cls._create_relation(field)
+                else:
+                    # The target has no Tortoise model, keep the key as a plain column
+                    attrs[field.attname] = cls._create_key(field)
+
             # Primary key fields
-            if field.primary_key:
+            elif field.primary_key:
                 if isinstance(field, models.BigAutoField):
                     attrs[name] = fields.BigIntField(pk=True)
                 elif isinstance(field, models.AutoField):
@@ -109,6 +122,10 @@ class TortoiseModelFactory:
             elif isinstance(field, models.BinaryField):
                 attrs[name] = fields.BinaryField(null=field.null)
 
+        for field in django_model._meta.local_many_to_many:
+            if issubclass(field.related_model, RaphaelMixin):
+                attrs[field.name] = cls._create_many_to_many(field)
+
         # Create Meta class
         table_name = django_model._meta.db_table or \
                      f"{django_model._meta.app_label}_{django_model._meta.model_name}"
@@ -119,14 +136,78 @@ class TortoiseModelFactory:
         attrs['Meta'] = Meta
 
         # Create the Tortoise model
-        model_name = f"{django_model.__name__}Tortoise"
-        tortoise_model = type(model_name, (TortoiseModel,), attrs)
+        tortoise_model = type(cls.get_model_name(django_model), (TortoiseModel,), attrs)
 
         # Cache the model
         cls._models[model_key] = tortoise_model
 
         return tortoise_model
 
+    @staticmethod
+    def get_model_name(django_model: Type[models.Model]) -> str:
+        """Name of the Tortoise model generated for a Django model, unique across apps"""
+        return f"{django_model._meta.app_label}_{django_model.__name__}Tortoise"
+
+    @staticmethod
+    def _get_related_name(rel) -> Any:
+        """Tortoise name of a reverse relation: Django's accessor, or False when hidden"""
+        if is_hidden_relation(rel):
+            return False
+        return rel.get_accessor_name()
+
+    @classmethod
+    def _create_relation(cls, field: models.Field):
+        """Map a ForeignKey or OneToOneField to a Tortoise relational field"""
+        related_model = field.related_model
+        kwargs = {
+            'related_name': cls._get_related_name(field.remote_field),
+            # Django emulates on_delete in Python, its constraints carry no action
+            'on_delete': fields.NO_ACTION,
+            'source_field': field.column,
+            'null': field.null,
+            'db_constraint': field.db_constraint,
+        }
+        if field.target_field is not related_model._meta.pk:
+            kwargs['to_field'] = field.target_field.name
+
+        model_name = f"models.{cls.get_model_name(related_model)}"
+        if isinstance(field, models.OneToOneField):
+            return fields.OneToOneField(model_name, pk=field.primary_key, **kwargs)
+        return fields.ForeignKeyField(model_name, **kwargs)
+
+    @staticmethod
+    def _create_key(field: models.Field):
+        """Map the key column of a relation whose target isn't a RaphaelMixin model"""
+        target = field.target_field
+        kwargs = {'source_field': field.column, 'null': field.null, 'pk': field.primary_key}
+
+        if isinstance(target, (models.BigAutoField, models.BigIntegerField)):
+            return fields.BigIntField(**kwargs)
+        if isinstance(target, (models.SmallAutoField, models.SmallIntegerField)):
+            return fields.SmallIntField(**kwargs)
+        if isinstance(target, models.UUIDField):
+            return fields.UUIDField(**kwargs)
+        if isinstance(target, models.CharField):
+            return fields.CharField(max_length=target.max_length, **kwargs)
+        return fields.IntField(**kwargs)
+
+    @classmethod
+    def _create_many_to_many(cls, field: models.ManyToManyField):
+        """Map a ManyToManyField to a Tortoise one over the same through table"""
+        rel = field.remote_field
+        related_name = cls._get_related_name(rel)
+        if related_name is False:
+            # Tortoise always creates the reverse side, give it a name nobody will use
+            related_name = f"_{field.model._meta.model_name}_{field.name}_reverse"
+
+        return fields.ManyToManyField(
+            f"models.{cls.get_model_name(field.related_model)}",
+            through=rel.through._meta.db_table,
+            forward_key=field.m2m_reverse_name(),
+            backward_key=field.m2m_column_name(),
+            related_name=related_name,
+        )
+
 
 class RaphaelMixin:
     """
@@ -138,6 +219,11 @@ class RaphaelMixin:
             title = models.CharField(max_length=200)
             author = models.CharField(max_length=100)
 
+            # Optional, see Book.aobjects.cached() and Book.aobjects.coalesced()
+            class RaphaelMeta:
+                cache = {"ttl": 30, "maxsize": 1024, "backend": None}
+                coalesce = True
+
         # Async operations
         book = await Book.aobjects.get(id=245)
         books = await Book.aobjects.filter(author="John").all()
@@ -147,46 +233,128 @@ class RaphaelMixin:
     aobjects = AsyncManagerDescriptor()
 
     async def asave(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        """Async save method"""
+        """
+        Async save method.
+
+        Instances loaded by django-raphael only UPDATE the fields changed since they were
+        loaded, and skip the query when nothing changed. Other instances write every loaded field.
+        """
         manager = self.__class__.aobjects
-        await manager._ensure_initialized()
+        tortoise_model = manager.tortoise_model or await manager._ensure_initialized()
+        db = (manager if using is None else manager.using(using))._db_for_write(instance=self)
+        updating = bool(self.pk) and not force_insert
 
         # Prepare data
         data = {}
         fields_to_update = update_fields or [f.name for f in self._meta.fields]
 
+        if update_fields is None and updating and self._get_loaded_values() is not None:
+            fields_to_update = self.get_dirty_fields()
+            if not fields_to_update:
+                return self
+        elif update_fields is None and not self._state.adding:
+            # Like Django, an instance with deferred fields only saves the loaded ones
+            deferred = self.get_deferred_fields()
+            fields_to_update = [f.attname for f in self._meta.fields if f.attname not in deferred]
+
         for field_name in fields_to_update:
             field = self._meta.get_field(field_name)
             if not field.primary_key:
-                value = getattr(self, field_name)
-                if value is not None:
-                    data[field_name] = value
+                # attname, so relations are saved from their key without being fetched
+                value = getattr(self, field.attname)
+                # None is written by updates, inserts leave the column to its default
+                if value is not None or updating:
+                    data[field.attname] = value
 
-        if self.pk and not force_insert:
+        if updating:
             # Update existing
-            await manager.tortoise_model.filter(pk=self.pk).update(**data)
+            await tortoise_model.filter(pk=self.pk).using_db(db).update(**data)
         else:
             # Create new
-            obj = await manager.tortoise_model.create(**data)
+            obj = await tortoise_model.create(using_db=db, **data)
             self.pk = obj.pk
+        await manager._cache.invalidate()
 
+        self._state.adding = False
+        self._state.db = db.connection_name
+        self._set_loaded_values(data if updating else self._get_current_values())
         return self
 
+    def get_dirty_fields(self) -> List[str]:
+        """
+        Attnames of the loaded fields changed since the instance was loaded or saved.
+
+        Fields holding a dict or a list, like JSONField, can change in place and are always dirty.
+        """
+        loaded = self._get_loaded_values()
+        if loaded is None:
+            return [attname for attname in self._get_current_values()]
+
+        dirty = []
+        for attname, value in self._get_current_values().items():
+            if attname not in loaded or isinstance(value, (dict, list)):
+                dirty.append(attname)
+            elif value != loaded[attname] or type(value) is not type(loaded[attname]):
+                dirty.append(attname)
+        return dirty
+
+    def _get_loaded_values(self) -> Optional[Dict[str, Any]]:
+        """Field values as django-raphael last loaded or saved them, None for other instances"""
+        loaded = getattr(self._state, 'raphael_loaded', None)
+        if loaded is None:
+            return None
+        return dict(zip(*loaded))
+
+    def _set_loaded_values(self, values: Dict[str, Any]):
+        """Record field values as stored in the database"""
+        loaded = self._get_loaded_values() or {}
+        loaded.update(values)
+        self._state.raphael_loaded = (tuple(loaded), tuple(loaded.values()))
+
+    def _get_current_values(self) -> Dict[str, Any]:
+        """Values of the loaded, non primary key, concrete fields"""
+        return {
+            field.attname: self.__dict__[field.attname] for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__
+        }
+
     async def adelete(self, using=None, keep_parents=False):
         """Async delete method"""
         if self.pk:
             manager = self.__class__.aobjects
-            await manager._ensure_initialized()
-            await manager.tortoise_model.filter(pk=self.pk).delete()
+            tortoise_model = manager.tortoise_model or await manager._ensure_initialized()
+            db = (manager if using is None else manager.using(using))._db_for_write(instance=self)
+            await tortoise_model.filter(pk=self.pk).using_db(db).delete()
+            await manager._cache.invalidate()
 
     async def arefresh_from_db(self, using=None, fields=None):
-        """Async refresh from database"""
+        """
+        Async refresh from database, selecting only the refreshed columns.
+
+        Like Django, deferred fields stay deferred unless they are named in `fields`:
+            await book.arefresh_from_db(fields=book.get_deferred_fields())
+        """
         if self.pk:
             manager = self.__class__.aobjects
-            await manager._ensure_initialized()
-            obj = await manager.tortoise_model.get(pk=self.pk)
-
-            fields_to_refresh = fields or [f.name for f in self._meta.fields]
-            for field_name in fields_to_refresh:
-                if hasattr(obj, field_name):
-                    setattr(self, field_name, getattr(obj, field_name))
+            tortoise_model = manager.tortoise_model or await manager._ensure_initialized()
+            db = (manager if using is None else manager.using(using))._db_for_read(instance=self)
+
+            if fields is None:
+                deferred = self.get_deferred_fields()
+                fields = [f.attname for f in self._meta.fields if f.attname not in deferred]
+            fields_to_refresh = [
+                field for field in map(self._meta.get_field, fields)
+                if field.attname in tortoise_model._meta.fields_map
+            ]
+            if not fields_to_refresh:
+                return
+
+            attnames = [field.attname for field in fields_to_refresh]
+            obj = await tortoise_model.filter(pk=self.pk).using_db(db).only(*attnames).get()
+
+            for field in fields_to_refresh:
+                setattr(self, field.attname, getattr(obj, field.attname))
+                # The cached related object may be another row now
+                if field.is_relation and field.is_cached(self):
+                    field.delete_cached_value(self)
+            self._set_loaded_values({attname: getattr(obj, attname) for attname in attnames})
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Marks a query shape that can't be compiled, so it isn't retried on every call
+UNCOMPILABLE = object()
+
+
+class CompiledQuery(NamedTuple):
+    """Parameterized SQL of a query shape and how to turn lookup values into its parameters"""
+    sql: str
+    encoders: Tuple[Callable[[Any], Any], ...]
+    # Parameters that don't depend on the lookups, like the LIMIT
+    tail: Tuple[Any, ...]
+
+    def params(self, values) -> List[Any]:
+        """Parameters of the query for these lookup values"""
+        params = [encode(value) for encode, value in zip(self.encoders, values)]
+        params.extend(self.tail)
+        return params
+
+
+class CompiledQueryCache:
+    """
+    Bounded LRU of the SQL Tortoise renders for each query shape of one model.
+
+    A shape is the operation, the database alias, the lookup names, the ordering and the
+    limit. Repeated shapes skip building and rendering the query, only the parameters are
+    encoded. The SQL text stays the same between calls, so asyncpg reuses the statement it
+    prepared on each connection (see `statement_cache_size`).
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    @classmethod
+    def from_model(cls, django_model) -> 'CompiledQueryCache':
+        """Build the cache sized by RaphaelMeta.compiled_queries, 0 disables it"""
+        maxsize = getattr(getattr(django_model, 'RaphaelMeta', None), 'compiled_queries', 256)
+        return cls(maxsize=maxsize)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the CompiledQuery of a shape, UNCOMPILABLE, or None when it isn't cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry is UNCOMPILABLE:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: Hashable, entry: Any):
+        """Store the CompiledQuery of a shape, or UNCOMPILABLE"""
+        if not self.maxsize:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def compile(self, tortoise_model, lookups: Sequence[str], values: Sequence[Any],
+                sql: str, params: Sequence[Any]) -> Any:
+        """
+        Return the CompiledQuery of SQL rendered for equality lookups, or UNCOMPILABLE.
+
+        Only plain field lookups compile, and only when encoding the values gives back the
+        leading parameters Tortoise rendered, so a compiled query never differs from a built one.
+        """
+        meta = tortoise_model._meta
+        encoders = []
+        for lookup in lookups:
+            field = meta.pk if lookup == 'pk' else meta.fields_map.get(lookup)
+            if field is None or lookup in meta.fetch_fields:
+                return UNCOMPILABLE
+            encoders.append(_encoder(field, tortoise_model))
+
+        compiled = CompiledQuery(sql, tuple(encoders), tuple(params[len(encoders):]))
+        try:
+            if compiled.params(values) != list(params):
+                return UNCOMPILABLE
+        except (TypeError, ValueError):
+            return UNCOMPILABLE
+        return compiled
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters, and the hit rate"""
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': self.hits / calls if calls else 0.0,
+        }
+
+
+def _encoder(field, tortoise_model):
+    def encode(value):
+        return field.to_db_value(value, tortoise_model)
+    return encode
@@ -0,0 +1,92 @@
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional, Set, Tuple
+
+from django.db import DEFAULT_DB_ALIAS
+from tortoise.transactions import in_transaction
+
+from django_raphael import bootstrap
+
+# Aliases of the atomic blocks open in the current context, innermost last
+_active: ContextVar[Tuple[str, ...]] = ContextVar('raphael_atomic', default=())
+# Result caches written to inside the outermost block, invalidated again when it ends
+_dirty_caches: ContextVar[Optional[Set]] = ContextVar('raphael_dirty_caches', default=None)
+
+
+class Atomic:
+    """
+    Runs a block in a transaction, a savepoint when it is nested in another one.
+
+    The transaction pins one pooled connection for the current context: every
+    django-raphael read and write on that alias goes through it, including reads that
+    the routers would send to a replica. Leaving the block with an exception rolls back.
+    """
+
+    def __init__(self, using: Optional[str] = None):
+        self.using = using
+        self._context = None
+        self._tokens = None
+
+    async def __aenter__(self):
+        await bootstrap.ensure_initialized()
+        alias = self.using or DEFAULT_DB_ALIAS
+
+        self._context = in_transaction(alias)
+        connection = await self._context.__aenter__()
+        self._tokens = (
+            _active.set(_active.get() + (alias,)),
+            _dirty_caches.set(set()) if _dirty_caches.get() is None else None,
+        )
+        return connection
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        active_token, dirty_token = self._tokens
+        dirty = _dirty_caches.get()
+        _active.reset(active_token)
+        if dirty_token is not None:
+            _dirty_caches.reset(dirty_token)
+
+        try:
+            return await self._context.__aexit__(exc_type, exc_value, traceback)
+        finally:
+            if dirty_token is not None:
+                # Other contexts could have cached rows this transaction changed or rolled back
+                for cache in dirty:
+                    await cache.invalidate()
+
+    def __call__(self, func):
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            async with Atomic(self.using):
+                return await func(*args, **kwargs)
+        return inner
+
+
+def atomic(using=None):
+    """
+    Open a transaction on a database alias, as an async context manager or a decorator.
+
+    Usage:
+        async with atomic():
+            book = await Book.aobjects.create(title="New", author="Author")
+            await Book.aobjects.filter(id=book.id).update(stock=F("stock") - 1)
+
+        @atomic(using="default")
+        async def checkout(book_id): ...
+    """
+    # @atomic without parentheses
+    if callable(using):
+        return Atomic()(using)
+    return Atomic(using)
+
+
+def active_aliases() -> Tuple[str, ...]:
+    """Aliases of the atomic blocks open in the current context"""
+    return _active.get()
+
+
+def invalidate_on_exit(cache):
+    """Invalidate a result cache again when the outermost atomic block ends"""
+    dirty = _dirty_caches.get()
+    if dirty is not None:
+        dirty.add(cache)
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+from django_raphael import bootstrap
+from test_project.books.models import Book
+from test_project.books.tortoise_models import TortoiseBook
+
+
+class Command(BaseCommand):
+    help = "Measure the per-call overhead of Book.aobjects.get against raw TortoiseBook.get."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10_000,
+            help="Number of calls per contender (default: 10,000)",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["iterations"]))
+
+    async def run(self, iterations):
+        await bootstrap.init()
+        try:
+            book_id = (await TortoiseBook.all().first()).id
+
+            # Warm up both paths so connection setup and cold stubs are not measured
+            await Book.aobjects.get(id=book_id)
+            await TortoiseBook.get(id=book_id)
+
+            tortoise_seconds = await self.measure(lambda: TortoiseBook.get(id=book_id), iterations)
+            raphael_seconds = await self.measure(lambda: Book.aobjects.get(id=book_id), iterations)
+        finally:
+            await bootstrap.close()
+
+        tortoise_us = tortoise_seconds / iterations * 1_000_000
+        raphael_us = raphael_seconds / iterations * 1_000_000
+        self.stdout.write(f"TortoiseBook.get:  {tortoise_us:8.1f} µs/call")
+        self.stdout.write(f"Book.aobjects.get: {raphael_us:8.1f} µs/call")
+        self.stdout.write(self.style.SUCCESS(f"Overhead:          {raphael_us - tortoise_us:8.1f} µs/call"))
+
+    @staticmethod
+    async def measure(call, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        return time.perf_counter() - start
@@ -1,4 +1,8 @@
+import asyncio
+import time
+
 from django.core.management.base import BaseCommand
+from django_raphael import bootstrap
 from test_project.books.models import Book
 from test_project.books.factories import BookFactory
 
@@ -18,13 +22,28 @@ class Command(BaseCommand):
             default=10_000,
             help="Batch size for bulk insert (default: 10,000)",
         )
+        parser.add_argument(
+            "--async-copy",
+            action="store_true",
+            help="Stream the books through Book.aobjects.acopy_from (COPY on PostgreSQL)",
+        )
 
     def handle(self, *args, **options):
         total = options["total"]
         batch_size = options["batch_size"]
 
         self.stdout.write(self.style.NOTICE(f"📚 Creating {total:,} books..."))
+        start = time.perf_counter()
+
+        if options["async_copy"]:
+            asyncio.run(self.copy_books(total, batch_size))
+        else:
+            self.create_books(total, batch_size)
 
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"🎉 Done seeding books in {elapsed:.1f}s!"))
+
+    def create_books(self, total, batch_size):
         objs = []
         for i in range(1, total + 1):
             objs.append(BookFactory.build())
@@ -37,4 +56,15 @@ class Command(BaseCommand):
         if objs:
             Book.objects.bulk_create(objs, batch_size=batch_size)
 
-        self.stdout.write(self.style.SUCCESS("🎉 Done seeding books!"))
+    async def copy_books(self, total, batch_size):
+        async def books():
+            for i in range(1, total + 1):
+                yield BookFactory.build()
+                if i % (batch_size * 5) == 0:
+                    self.stdout.write(self.style.SUCCESS(f"✅ Streamed {i:,}/{total:,}"))
+
+        await bootstrap.init()
+        try:
+            await Book.aobjects.acopy_from(books(), batch_size=batch_size)
+        finally:
+            await bootstrap.close()
@@ -1,7 +1,8 @@
 from django.db import models
+from django_raphael.models import RaphaelMixin
 
 
-class Book(models.Model):
+class Book(RaphaelMixin, models.Model):
     isbn = models.CharField(max_length=13, unique=True)
 
     title = models.CharField(max_length=255)
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django_raphael",
     "test_project.books",
 ]
 
@@ -85,6 +86,16 @@ DATABASES = {
 }
 
 
+# Django Raphael
+# TortoiseBook is hand-written for the benchmarks, register it next to the generated models
+
+RAPHAEL = {
+    "EXTRA_MODULES": [
+        "test_project.books.tortoise_models",
+    ],
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
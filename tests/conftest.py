@@ -0,0 +1,55 @@
+import asyncio
+import os
+
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from tortoise import Tortoise  # noqa: E402
+
+from tests.otherapp.models import Author as OtherAuthor  # noqa: E402
+from tests.relapp.models import Author, Novel  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def tables():
+    with connection.schema_editor() as editor:
+        editor.create_model(Author)
+        editor.create_model(Novel)
+        editor.create_model(OtherAuthor)
+
+
+@pytest.fixture(scope='session')
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(Tortoise.close_connections())
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    """Run a coroutine on the loop every test shares, Tortoise stays bound to it"""
+    yield loop.run_until_complete
+    Novel.objects.all().delete()
+    Author.objects.all().delete()
+    OtherAuthor.objects.all().delete()
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """SQL of every query run on the SQLite clients, in order"""
+    from tortoise.backends.sqlite.client import SqliteClient
+
+    statements = []
+    execute_query = SqliteClient.execute_query
+
+    async def recording_execute_query(self, sql, values=None):
+        statements.append(sql)
+        return await execute_query(self, sql, values)
+
+    monkeypatch.setattr(SqliteClient, 'execute_query', recording_execute_query)
+    return statements
@@ -0,0 +1,8 @@
+from django.db import models
+
+from django_raphael.models import RaphaelMixin
+
+
+class Author(RaphaelMixin, models.Model):
+    """Shares its class name with relapp.Author"""
+    nickname = models.CharField(max_length=100)
@@ -0,0 +1,15 @@
+from django.db import models
+
+from django_raphael.models import RaphaelMixin
+
+
+class Author(RaphaelMixin, models.Model):
+    name = models.CharField(max_length=100)
+
+
+class Novel(RaphaelMixin, models.Model):
+    title = models.CharField(max_length=200)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, null=True)
+    price = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+    published_date = models.DateField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+SECRET_KEY = 'django-raphael-tests'
+USE_TZ = True
+TIME_ZONE = 'UTC'
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django_raphael',
+    'tests.relapp',
+    'tests.otherapp',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.mkdtemp(prefix='raphael-'), 'db.sqlite3'),
+    },
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
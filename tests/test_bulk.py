@@ -0,0 +1,36 @@
+import pytest
+
+from tests.relapp.models import Novel
+
+
+def test_bulk_create_fills_auto_now_add(run):
+    async def scenario():
+        novels = await Novel.aobjects.bulk_create(
+            [Novel(title=f'N{index}') for index in range(5)], batch_size=2, concurrency=2
+        )
+        stored = await Novel.aobjects.order_by('id').values_list('created_at', flat=True)
+        return novels, stored
+
+    novels, stored = run(scenario())
+    assert all(novel.created_at is not None for novel in novels)
+    assert sorted(stored) == sorted(novel.created_at for novel in novels)
+
+
+def test_bulk_create_rejects_zero_concurrency(run):
+    with pytest.raises(ValueError):
+        run(Novel.aobjects.bulk_create([Novel(title='N1')], concurrency=0))
+
+
+def test_bulk_create_sets_primary_keys(run):
+    async def scenario():
+        novels = await Novel.aobjects.bulk_create(
+            [Novel(title=f'N{index}') for index in range(3)], batch_size=2, atomic=True
+        )
+        novels[1].title = 'Changed'
+        await novels[1].asave()
+        stored = await Novel.aobjects.order_by('id').values_list('id', 'title')
+        return novels, stored
+
+    novels, stored = run(scenario())
+    assert all(not novel._state.adding for novel in novels)
+    assert stored == [(novel.pk, title) for novel, title in zip(novels, ['N0', 'Changed', 'N2'])]
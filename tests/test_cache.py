@@ -0,0 +1,62 @@
+from tests.relapp.models import Author
+
+
+def test_cached_get_with_list_lookup(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        cached = Author.aobjects.cached(30)
+        hits = cached.stats()['cache']['hits']
+        first = await cached.get(id__in=[author.id])
+        second = await cached.get(id__in={author.id})
+        return author, first, second, cached.stats()['cache']['hits'] - hits
+
+    author, first, second, hits = run(scenario())
+    assert first.pk == second.pk == author.pk
+    assert hits == 1
+
+
+def test_backend_invalidation_reaches_other_processes(run):
+    from django_raphael.cache import MISSING, QueryCache
+
+    # Two processes sharing one cache backend
+    writer, reader = QueryCache(Author, backend='default'), QueryCache(Author, backend='default')
+    key = reader.make_key('get', 'default', {'id': 1})
+
+    async def scenario():
+        await reader.set(key, ('A',), 30, await reader.snapshot())
+        cached = await reader.get(key, await reader.snapshot())
+        await writer.invalidate()
+        return cached, await reader.get(key, await reader.snapshot())
+
+    cached, after = run(scenario())
+    assert cached == ('A',)
+    assert after is MISSING
+
+
+def test_writes_invalidate_cached_get(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        cached = Author.aobjects.cached(30)
+        before = await cached.get(id=author.id)
+        await Author.aobjects.filter(id=author.id).update(name='B')
+        after_update = await cached.get(id=author.id)
+        author.name = 'C'
+        await author.asave()
+        after_save = await cached.get(id=author.id)
+        return before.name, after_update.name, after_save.name
+
+    assert run(scenario()) == ('A', 'B', 'C')
+
+
+def test_stale_writes_from_sync_orm_until_invalidated(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        cached = Author.aobjects.cached(30)
+        await cached.get(id=author.id)
+        # Writes that bypass django-raphael need an explicit invalidation
+        await Author.objects.filter(id=author.id).aupdate(name='B')
+        stale = await cached.get(id=author.id)
+        await Author.aobjects.invalidate_cache()
+        return stale.name, (await cached.get(id=author.id)).name
+
+    assert run(scenario()) == ('A', 'B')
@@ -0,0 +1,37 @@
+import asyncio
+
+from tests.relapp.models import Author
+
+
+def test_concurrent_identical_reads_share_one_query(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        manager = Author.aobjects.coalesced()
+        before = manager.stats()['coalescing']
+        results = await asyncio.gather(
+            *(manager.filter(name='A') for _ in range(3)),
+            manager.get(id=author.id),
+        )
+        after = manager.stats()['coalescing']
+        return results, after['calls'] - before['calls'], after['merged'] - before['merged']
+
+    results, calls, merged = run(scenario())
+    lists, obj = results[:3], results[3]
+    assert (calls, merged) == (2, 2)
+    assert [[author.name for author in authors] for authors in lists] == [['A']] * 3
+    # Every caller builds its own instances from the shared records
+    assert len({id(authors[0]) for authors in lists} | {id(obj)}) == 4
+
+
+def test_transactions_skip_coalescing(run):
+    from django_raphael.transactions import atomic
+
+    async def scenario():
+        await Author.aobjects.create(name='A')
+        manager = Author.aobjects.coalesced()
+        before = manager.stats()['coalescing']['calls']
+        async with atomic():
+            await asyncio.gather(*(manager.filter(name='A') for _ in range(2)))
+        return manager.stats()['coalescing']['calls'] - before
+
+    assert run(scenario()) == 0
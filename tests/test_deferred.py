@@ -0,0 +1,36 @@
+import decimal
+
+from tests.relapp.models import Novel
+
+
+def test_only_and_defer(run, statements):
+    async def scenario():
+        await Novel.aobjects.create(title='N1', price=decimal.Decimal('9.50'))
+        statements.clear()
+        only = await Novel.aobjects.only('title').get(title='N1')
+        deferred = await Novel.aobjects.defer('price', 'created_at').get(title='N1')
+        return only, deferred
+
+    only, deferred = run(scenario())
+    # Only the loaded columns, and the primary key, are selected
+    assert 'price' not in statements[0] and '"title"' in statements[0]
+    assert 'price' not in statements[1] and 'created_at' not in statements[1]
+    assert only.title == 'N1'
+    assert only.get_deferred_fields() == {'author_id', 'price', 'published_date', 'created_at'}
+    assert deferred.get_deferred_fields() == {'price', 'created_at'}
+
+
+def test_deferred_fields_refresh_and_save(run):
+    async def scenario():
+        await Novel.aobjects.create(title='N1', price=decimal.Decimal('9.50'))
+        novel = await Novel.aobjects.only('title').get(title='N1')
+        novel.title = 'N2'
+        # Saving an instance with deferred fields leaves them untouched
+        await novel.asave()
+        await novel.arefresh_from_db(fields=['price'])
+        return novel
+
+    novel = run(scenario())
+    assert novel.title == 'N2'
+    assert novel.price == decimal.Decimal('9.50')
+    assert 'price' not in novel.get_deferred_fields()
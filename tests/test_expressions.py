@@ -0,0 +1,79 @@
+import datetime
+
+from django.db.models import Count, F, Q
+
+from tests.relapp.models import Author, Novel
+
+
+def test_reverse_relation_lookups(run):
+    async def scenario():
+        first = await Author.aobjects.create(name='A')
+        second = await Author.aobjects.create(name='B')
+        await Novel.aobjects.create(title='N1', author=first)
+        await Novel.aobjects.create(title='N2', author=first)
+        await Novel.aobjects.create(title='N3', author=second)
+        names = await Author.aobjects.filter(novel__title='N3').values_list('name', flat=True)
+        counts = await Author.aobjects.order_by('name').annotate(count=Count('novel')).values_list(
+            'name', 'count'
+        )
+        return names, counts
+
+    names, counts = run(scenario())
+    assert names == ['B']
+    assert counts == [('A', 2), ('B', 1)]
+
+
+def test_date_transforms(run):
+    async def scenario():
+        await Novel.aobjects.create(title='N1', published_date=datetime.date(2019, 12, 31))
+        await Novel.aobjects.create(title='N2', published_date=datetime.date(2020, 1, 1))
+        await Novel.aobjects.create(title='N3', published_date=datetime.date(2021, 6, 1))
+        queryset = Novel.aobjects.order_by('id').values_list('title', flat=True)
+        today = datetime.date.today()
+        return (
+            await queryset.filter(published_date__year=2020),
+            await queryset.filter(published_date__year__gte=2020),
+            await queryset.filter(published_date__year__lt=2020),
+            await queryset.filter(published_date__year__in=[2019, 2021]),
+            await queryset.filter(Q(published_date__year__range=(2019, 2020)) & ~Q(title='N1')),
+            await queryset.filter(created_at__date=today).count(),
+        )
+
+    assert run(scenario()) == (['N2'], ['N2', 'N3'], ['N1'], ['N1', 'N3'], ['N2'], 3)
+
+
+def test_regex_lookups(run):
+    async def scenario():
+        await Novel.aobjects.create(title='Dune')
+        await Novel.aobjects.create(title='Emma')
+        return (
+            await Novel.aobjects.filter(title__regex=r'^D').values_list('title', flat=True),
+            await Novel.aobjects.filter(title__iregex=r'^e').values_list('title', flat=True),
+        )
+
+    assert run(scenario()) == (['Dune'], ['Emma'])
+
+
+def test_update_with_f_expression(run):
+    async def scenario():
+        novel = await Novel.aobjects.create(title='N1', price=10)
+        await Novel.aobjects.filter(id=novel.id).update(price=F('price') - 1)
+        return await Novel.aobjects.values_list('price', flat=True).get(id=novel.id)
+
+    assert run(scenario()) == 9
+
+
+def test_memos_stay_bounded():
+    from django.db.models import Sum, Value
+
+    from django_raphael.expressions import ExpressionConverter
+
+    class SmallConverter(ExpressionConverter):
+        MEMO_SIZE = 8
+
+    converter = SmallConverter(Novel)
+    for index in range(1, 30):
+        converter.to_python(Sum('price', filter=Q(title=f'N{index}')) + Value(index))
+        converter.convert_q(Q(*[Q(title=f'N{item}') for item in range(index)], _connector=Q.OR))
+    assert len(converter._to_python) == 8
+    assert len(converter._filters) == 8
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from tortoise.exceptions import DoesNotExist
+
+from tests.relapp.models import Author
+
+
+def test_concurrent_lookups_are_batched(run, monkeypatch):
+    from django_raphael.managers import RaphaelManager
+
+    batches = []
+    in_bulk = RaphaelManager.in_bulk
+
+    async def recording_in_bulk(self, id_list=None, *args, **kwargs):
+        batches.append(sorted(id_list))
+        return await in_bulk(self, id_list, *args, **kwargs)
+
+    async def scenario():
+        first, second = await Author.aobjects.create(name='A'), await Author.aobjects.create(name='B')
+        monkeypatch.setattr(RaphaelManager, 'in_bulk', recording_in_bulk)
+        loader = Author.aobjects.loader
+        results = await asyncio.gather(
+            loader.get(id=first.id), loader.load(str(second.id)), loader.get(pk=first.id),
+        )
+        return first, second, results
+
+    first, second, results = run(scenario())
+    assert batches == [[first.id, second.id]]
+    assert [author.name for author in results] == ['A', 'B', 'A']
+    assert results[0] is not results[2]
+
+
+def test_missing_rows_raise(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        return await asyncio.gather(
+            Author.aobjects.loader.load(author.id),
+            Author.aobjects.loader.load(author.id + 1),
+            return_exceptions=True,
+        )
+
+    found, missing = run(scenario())
+    assert found.name == 'A'
+    assert isinstance(missing, DoesNotExist)
+
+
+def test_only_unique_fields_are_batched():
+    with pytest.raises(ValueError):
+        Author.aobjects.loader.get(name='A')
@@ -0,0 +1,51 @@
+import decimal
+
+from tests.relapp.models import Novel
+
+
+def test_asave_updates_only_dirty_fields(run, statements):
+    async def scenario():
+        await Novel.aobjects.create(title='N1', price=decimal.Decimal('9.50'))
+        novel = await Novel.aobjects.get(title='N1')
+        clean = novel.get_dirty_fields()
+
+        statements.clear()
+        await novel.asave()
+        skipped = list(statements)
+
+        novel.price = None
+        dirty = novel.get_dirty_fields()
+        await novel.asave()
+        return clean, skipped, dirty, novel.get_dirty_fields()
+
+    clean, skipped, dirty, after = run(scenario())
+    assert clean == [] and skipped == []
+    assert dirty == ['price']
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE') and '"price"' in statements[0]
+    assert '"title"' not in statements[0]
+    assert after == []
+
+
+def test_asave_writes_none(run):
+    async def scenario():
+        await Novel.aobjects.create(title='N1', price=decimal.Decimal('9.50'))
+        novel = await Novel.aobjects.get(title='N1')
+        novel.price = None
+        await novel.asave()
+        return await Novel.aobjects.values_list('price', flat=True).get(title='N1')
+
+    assert run(scenario()) is None
+
+
+def test_unloaded_instances_save_every_field(run):
+    async def scenario():
+        novel = Novel(title='N1')
+        dirty = novel.get_dirty_fields()
+        await novel.asave()
+        return dirty, novel.get_dirty_fields(), await Novel.aobjects.all().count()
+
+    dirty, after, count = run(scenario())
+    assert 'title' in dirty
+    assert after == []
+    assert count == 1
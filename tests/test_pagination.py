@@ -0,0 +1,36 @@
+from tests.relapp.models import Novel
+
+
+def test_page_after_datetime_ordering(run):
+    async def scenario():
+        for index in range(7):
+            await Novel.aobjects.create(title=f'N{index}')
+
+        queryset = Novel.aobjects.order_by('created_at', 'id')
+        seen, cursor = [], None
+        for _ in range(10):
+            page = await queryset.page_after(cursor, size=2)
+            seen.extend(novel.pk for novel in page.objects)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        return seen, [novel.pk for novel in await queryset]
+
+    seen, expected = run(scenario())
+    assert seen == expected
+    assert len(expected) == 7
+
+
+def test_cursor_keeps_microseconds(run):
+    async def scenario():
+        await Novel.aobjects.create(title='N1')
+        await Novel.aobjects.create(title='N2')
+        queryset = Novel.aobjects.order_by('created_at', 'id')
+        page = await queryset.page_after(size=1)
+        return queryset, page
+
+    queryset, page = run(scenario())
+    keyset = queryset._get_keyset()
+    created_at, pk = queryset._decode_cursor(keyset, page.next_cursor)
+    assert created_at == page.objects[0].created_at
+    assert pk == page.objects[0].pk
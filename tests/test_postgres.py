@@ -0,0 +1,121 @@
+"""SQL that django-raphael sends to PostgreSQL, rendered against an asyncpg client that never connects"""
+import decimal
+
+import pytest
+from tortoise import connections
+from tortoise.backends.asyncpg import AsyncpgDBClient
+
+from tests.relapp.models import Novel
+
+
+class FakeConnection:
+    """Stands in for an asyncpg connection, recording what it is asked to run"""
+
+    def __init__(self, records=()):
+        self.records = list(records)
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def transaction(self):
+        self.calls.append(('transaction',))
+        return self
+
+    def cursor(self, sql, *params, prefetch=None):
+        self.calls.append(('cursor', sql, params, prefetch))
+
+        async def records():
+            for record in self.records:
+                yield record
+        return records()
+
+    async def copy_records_to_table(self, table, records, columns, schema_name=None):
+        rows = [record async for record in records]
+        self.calls.append(('copy', table, tuple(columns), rows))
+        return f'COPY {len(rows)}'
+
+
+@pytest.fixture
+def pg(run, monkeypatch):
+    # Tortoise has to be initialized before the models can render SQL
+    run(Novel.aobjects.all().count())
+    client = AsyncpgDBClient(connection_name='pg', host='localhost', database='raphael')
+    token = connections.set('pg', client)
+
+    # Tortoise renders querysets in the dialect of the model's default connection
+    meta = Novel.aobjects.tortoise_model._meta
+    basequery = client.query_class.from_(meta.basetable)
+    monkeypatch.setattr(meta, 'basequery', basequery)
+    monkeypatch.setattr(meta, 'basequery_all_fields', basequery.select(*meta.db_fields))
+    yield client
+    connections.reset(token)
+
+
+def test_bulk_update_renders_update_from_values(run, pg, monkeypatch):
+    queries = []
+
+    async def execute_query(sql, values=None):
+        queries.append((sql, values))
+        return len(values) // 2, []
+
+    monkeypatch.setattr(pg, 'execute_query', execute_query)
+    novels = [Novel(id=1, title='A'), Novel(id=2, title='B')]
+    assert run(Novel.aobjects.using('pg').bulk_update(novels, ['title'])) == 2
+
+    assert queries == [(
+        'UPDATE "relapp_novel" AS "t" SET "title" = "v"."title" '
+        'FROM (VALUES ($1::INT, $2::VARCHAR(200)), ($3::INT, $4::VARCHAR(200))) '
+        'AS "v" ("id", "title") WHERE "t"."id" = "v"."id"',
+        [1, 'A', 2, 'B'],
+    )]
+
+
+def test_bulk_create_returns_primary_keys(run, pg, monkeypatch):
+    queries = []
+
+    async def execute_query(sql, values=None):
+        queries.append(sql)
+        return 2, [{'id': 7}, {'id': 8}]
+
+    monkeypatch.setattr(pg, 'execute_query', execute_query)
+    novels = run(Novel.aobjects.using('pg').bulk_create([Novel(title='A'), Novel(title='B')]))
+
+    assert [novel.pk for novel in novels] == [7, 8]
+    assert len(queries) == 1
+    assert queries[0].startswith('INSERT INTO "relapp_novel"')
+    assert queries[0].endswith('RETURNING "id"')
+
+
+def test_acopy_from_streams_records_through_copy(run, pg, monkeypatch):
+    connection = FakeConnection()
+    monkeypatch.setattr(pg, 'acquire_connection', lambda: connection)
+
+    novels = [Novel(title='A', price=decimal.Decimal('1.50')), Novel(title='B')]
+    assert run(Novel.aobjects.using('pg').acopy_from(novels, fields=['title', 'price'])) == 2
+    assert connection.calls == [
+        ('copy', 'relapp_novel', ('title', 'price'), [('A', decimal.Decimal('1.50')), ('B', None)]),
+    ]
+
+
+def test_aiterator_reads_through_a_server_side_cursor(run, pg, monkeypatch):
+    connection = FakeConnection(records=[
+        {'id': 1, 'title': 'A', 'author_id': None, 'price': None,
+         'published_date': None, 'created_at': None},
+    ])
+    monkeypatch.setattr(pg, 'acquire_connection', lambda: connection)
+
+    async def scenario():
+        queryset = Novel.aobjects.using('pg').filter(title='A')
+        return [novel async for novel in queryset.aiterator(chunk_size=100)]
+
+    novels = run(scenario())
+    assert [(novel.pk, novel.title) for novel in novels] == [(1, 'A')]
+    assert connection.calls[0] == ('transaction',)
+    _, sql, params, prefetch = connection.calls[1]
+    assert sql.startswith('SELECT') and sql.endswith('FROM "relapp_novel" WHERE "title"=$1')
+    assert params == ('A',)
+    assert prefetch == 100
@@ -0,0 +1,33 @@
+from tests.relapp.models import Author, Novel
+
+
+def test_create_with_related_instance(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        novel = await Novel.aobjects.create(title='N1', author=author)
+        fetched, created = await Novel.aobjects.get_or_create(title='N1', author=author)
+        updated, _ = await Novel.aobjects.update_or_create(
+            title='N2', defaults={'author': author}
+        )
+        return author, novel, fetched, created, updated
+
+    author, novel, fetched, created, updated = run(scenario())
+    assert novel.author_id == author.pk
+    assert fetched.pk == novel.pk and not created
+    assert updated.author_id == author.pk
+
+
+def test_order_by_relations(run):
+    async def scenario():
+        first, second = await Author.aobjects.create(name='A'), await Author.aobjects.create(name='B')
+        await Novel.aobjects.create(title='Z', author=first)
+        await Novel.aobjects.create(title='Y', author=second)
+        novels = await Novel.aobjects.order_by('-author')
+        authors = await Author.aobjects.order_by('novel__title')
+        last = await Novel.aobjects.order_by('author').last()
+        return first, second, novels, authors, last
+
+    first, second, novels, authors, last = run(scenario())
+    assert [novel.author_id for novel in novels] == [second.pk, first.pk]
+    assert [author.name for author in authors] == ['B', 'A']
+    assert last.author_id == second.pk
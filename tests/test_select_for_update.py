@@ -0,0 +1,34 @@
+import pytest
+from django.core.exceptions import FieldError
+
+from django_raphael.transactions import atomic
+from tests.relapp.models import Novel
+
+
+def test_of_locks_the_join_alias(run):
+    async def scenario():
+        async with atomic() as connection:
+            capabilities = connection.capabilities
+            # SQLite has no row locks, render the clause as PostgreSQL would
+            object.__setattr__(capabilities, 'support_for_update', True)
+            try:
+                queryset = Novel.aobjects.select_related('author').select_for_update(of=('self', 'author'))
+                tortoise_queryset = await queryset._build()
+            finally:
+                object.__setattr__(capabilities, 'support_for_update', False)
+            tortoise_queryset._make_query()
+            return tortoise_queryset.query.get_sql()
+
+    sql = run(scenario())
+    locked = sql.split(' FOR UPDATE OF ')[1]
+    assert sorted(locked.split(', ')) == ['"relapp_novel"', '"relapp_novel__author"']
+    assert 'LEFT OUTER JOIN "relapp_author" "relapp_novel__author"' in sql
+
+
+def test_of_requires_select_related(run):
+    async def scenario():
+        async with atomic():
+            await Novel.aobjects.select_for_update(of=('author',))
+
+    with pytest.raises(FieldError):
+        run(scenario())
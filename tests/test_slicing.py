@@ -0,0 +1,28 @@
+from tests.relapp.models import Novel
+
+
+def test_empty_slices_read_nothing(run):
+    async def scenario():
+        for index in range(3):
+            await Novel.aobjects.create(title=f'N{index}')
+        queryset = Novel.aobjects.all()
+        return (
+            await queryset.values_list('id', flat=True)[:0],
+            await queryset[:0],
+            await queryset[2:2].count(),
+            await queryset[:0].exists(),
+            await queryset[:0].first(),
+            [novel async for novel in queryset[:0]],
+        )
+
+    assert run(scenario()) == ([], [], 0, False, None, [])
+
+
+def test_exists_respects_offset(run):
+    async def scenario():
+        for index in range(3):
+            await Novel.aobjects.create(title=f'N{index}')
+        queryset = Novel.aobjects.order_by('id')
+        return await queryset[2:].exists(), await queryset[3:].exists(), await queryset[100:].exists()
+
+    assert run(scenario()) == (True, False, False)
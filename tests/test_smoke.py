@@ -0,0 +1,61 @@
+import pytest
+
+from tests.relapp.models import Author, Novel
+
+
+def test_create_and_get(run):
+    async def scenario():
+        novel = await Novel.aobjects.create(title='N1')
+        fetched = await Novel.aobjects.get(id=novel.id)
+        return novel, fetched
+
+    novel, fetched = run(scenario())
+    assert isinstance(fetched, Novel)
+    assert fetched.pk == novel.pk
+    assert fetched.title == 'N1'
+
+
+def test_filter_queryset(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        await Novel.aobjects.create(title='N1', author_id=author.pk)
+        await Novel.aobjects.create(title='N2')
+        novels = await Novel.aobjects.filter(author_id=author.pk).order_by('id')
+        return novels, await Novel.aobjects.all().count()
+
+    novels, count = run(scenario())
+    assert [novel.title for novel in novels] == ['N1']
+    assert count == 2
+
+
+def test_same_model_name_in_two_apps(run):
+    from tests.otherapp.models import Author as OtherAuthor
+
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        other = await OtherAuthor.aobjects.create(nickname='B')
+        return (
+            await Author.aobjects.get(id=author.id),
+            await OtherAuthor.aobjects.get(id=other.id),
+        )
+
+    author, other = run(scenario())
+    assert isinstance(author, Author) and author.name == 'A'
+    assert isinstance(other, OtherAuthor) and other.nickname == 'B'
+
+
+def test_instance_methods_reuse_the_manager(run, monkeypatch):
+    from django_raphael.managers import RaphaelManager
+
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        monkeypatch.setattr(RaphaelManager, 'using', lambda self, alias: pytest.fail('cloned'))
+        author.name = 'B'
+        await author.asave()
+        await author.arefresh_from_db()
+        await author.adelete()
+        return author, await Author.aobjects.all().count()
+
+    author, count = run(scenario())
+    assert author.name == 'B'
+    assert count == 0
@@ -0,0 +1,72 @@
+import pytest
+
+from django_raphael.transactions import active_aliases, atomic
+from tests.relapp.models import Author
+
+
+def test_atomic_commits_and_rolls_back(run):
+    async def scenario():
+        async with atomic():
+            await Author.aobjects.create(name='A')
+            assert active_aliases() == ('default',)
+            # Reads go through the transaction's connection and see its writes
+            inside = await Author.aobjects.filter(name='A').count()
+
+        with pytest.raises(ZeroDivisionError):
+            async with atomic():
+                await Author.aobjects.create(name='B')
+                1 / 0
+
+        names = await Author.aobjects.order_by('id').values_list('name', flat=True)
+        return inside, names, active_aliases()
+
+    assert run(scenario()) == (1, ['A'], ())
+
+
+def test_nested_atomic_uses_savepoints(run):
+    async def scenario():
+        async with atomic():
+            await Author.aobjects.create(name='A')
+            try:
+                async with atomic():
+                    await Author.aobjects.create(name='B')
+                    raise ValueError
+            except ValueError:
+                pass
+            await Author.aobjects.create(name='C')
+        return await Author.aobjects.order_by('id').values_list('name', flat=True)
+
+    assert run(scenario()) == ['A', 'C']
+
+
+def test_atomic_decorator(run):
+    @atomic
+    async def create_both(fail):
+        await Author.aobjects.create(name='A')
+        if fail:
+            raise RuntimeError
+        await Author.aobjects.create(name='B')
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await create_both(True)
+        await create_both(False)
+        return await Author.aobjects.order_by('id').values_list('name', flat=True)
+
+    assert run(scenario()) == ['A', 'B']
+
+
+def test_cached_get_after_rollback(run):
+    async def scenario():
+        author = await Author.aobjects.create(name='A')
+        cached = Author.aobjects.cached(30)
+        await cached.get(id=author.id)
+        with pytest.raises(RuntimeError):
+            async with atomic():
+                await Author.aobjects.filter(id=author.id).update(name='B')
+                # The cache is skipped inside the block
+                assert (await cached.get(id=author.id)).name == 'B'
+                raise RuntimeError
+        return (await cached.get(id=author.id)).name
+
+    assert run(scenario()) == 'A'